@@ -1,52 +1,230 @@
 import os
 import json
 import random
+import itertools
 import sqlite3
 import datetime as dt
+import hashlib
+import time
+import threading
 import subprocess
 import platform
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from types import SimpleNamespace
+import importlib.util
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, font as tkfont
 
-# Matplotlib imports for Tkinter embedding
-from matplotlib.figure import Figure
-try:
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-except Exception:
-    FigureCanvasTkAgg = None
+# Heavy optional libraries (matplotlib, QR encoders, reportlab, openpyxl) are imported on
+# first use through the _get_* helpers below; most sessions only place orders and never
+# draw a chart, print a receipt or export a sheet. The *_available flags only look the
+# package up, they do not import it.
+def _module_available(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+matplotlib_available = _module_available("matplotlib")
+segno_available = _module_available("segno")
+qrcode_available = _module_available("qrcode")
+reportlab_available = _module_available("reportlab")
+openpyxl_available = _module_available("openpyxl")
 
-# QR code generation
+# NumPy for vectorized cart pricing (StudentDashboard._reprice_cart); cheap next to the libraries above
 try:
-    import qrcode
+    import numpy as np
 except Exception:
-    qrcode = None
+    np = None
+
+
+@lru_cache(maxsize=None)
+def _get_matplotlib():
+    """Import matplotlib's Figure and Tk canvas; None if matplotlib is missing."""
+    try:
+        from matplotlib.figure import Figure
+    except Exception:
+        return None
+    try:
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    except Exception:
+        FigureCanvasTkAgg = None
+    return SimpleNamespace(Figure=Figure, FigureCanvasTkAgg=FigureCanvasTkAgg)
+
+
+@lru_cache(maxsize=None)
+def _get_segno():
+    try:
+        import segno
+    except Exception:
+        return None
+    return segno
+
+
+@lru_cache(maxsize=None)
+def _get_qrcode():
+    try:
+        import qrcode
+    except Exception:
+        return None
+    return qrcode
+
 
-# PDF generation for receipts
+@lru_cache(maxsize=None)
+def _get_pil():
+    """Import Pillow's Image and ImageTk for scaling the QR preview; None if Pillow is missing."""
+    try:
+        from PIL import Image, ImageTk
+    except Exception:
+        return None
+    return SimpleNamespace(Image=Image, ImageTk=ImageTk)
+
+
+@lru_cache(maxsize=None)
+def _get_reportlab():
+    """Import reportlab and build the static receipt styles once; None if reportlab is missing."""
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib import colors
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.enums import TA_CENTER
+    except Exception:
+        return None
+
+    col_title = colors.HexColor('#1a1f2e')
+    col_heading = colors.HexColor('#2c3e50')
+    col_panel = colors.HexColor('#ecf0f1')
+    col_table_header = colors.HexColor('#34495e')
+    col_row_alt = colors.HexColor('#f8f9fa')
+
+    sample_styles = getSampleStyleSheet()
+    normal_style = sample_styles['Normal']
+    normal_style.fontSize = 10
+    normal_style.leading = 14
+    return SimpleNamespace(
+        A4=A4,
+        inch=inch,
+        SimpleDocTemplate=SimpleDocTemplate,
+        Table=Table,
+        Paragraph=Paragraph,
+        Spacer=Spacer,
+        Image=Image,
+        title_style=ParagraphStyle(
+            'CustomTitle',
+            parent=sample_styles['Heading1'],
+            fontSize=24,
+            textColor=col_title,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        heading_style=ParagraphStyle(
+            'CustomHeading',
+            parent=sample_styles['Heading2'],
+            fontSize=14,
+            textColor=col_heading,
+            spaceAfter=12,
+            fontName='Helvetica-Bold'
+        ),
+        normal_style=normal_style,
+        footer_style=ParagraphStyle('Footer', parent=normal_style, fontSize=8,
+                                    textColor=colors.grey, alignment=TA_CENTER),
+        info_table_style=TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), col_panel),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ]),
+        items_table_style=TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), col_table_header),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('TOPPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, col_row_alt]),
+        ]),
+        total_table_style=TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (2, 0), (-1, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (2, 0), (-1, -1), 12),
+            ('TEXTCOLOR', (2, 0), (-1, -1), col_heading),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 10),
+        ]),
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_openpyxl():
+    """Import the openpyxl pieces the fallback Excel export uses; None if openpyxl is missing."""
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+        from openpyxl.utils import get_column_letter
+    except Exception:
+        return None
+    return SimpleNamespace(
+        Workbook=Workbook,
+        WriteOnlyCell=WriteOnlyCell,
+        get_column_letter=get_column_letter,
+        header_style=NamedStyle(
+            name='export_header',
+            fill=PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+            font=Font(bold=True, color="FFFFFF"),
+            alignment=Alignment(horizontal='center', vertical='center'),
+        ),
+    )
+
+# Streaming Excel writer (preferred over openpyxl for exports)
 try:
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT
-    reportlab_available = True
+    import xlsxwriter
+    xlsxwriter_available = True
 except Exception:
-    reportlab_available = False
+    xlsxwriter_available = False
 
-# Excel/CSV export
+# Faster JSON encoding for the orders.items column
 try:
-    import pandas as pd
-    pandas_available = True
-except Exception:
-    pandas_available = False
+    import orjson
 
-import csv
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except Exception:
+    orjson = None
+    json_dumps = json.dumps
 
 
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 DB_PATH = os.path.join(os.path.dirname(__file__), "canteen.db")
 UPI_ID = "jaskaran.singh.170506@okaxis"  # demo UPI id
+PLATFORM = platform.system()  # resolved once; used to pick the file opener
+TOKEN_SPACE = tuple(str(n) for n in range(1000, 10000))  # 4-digit order tokens
+
+
+# Column order shared by the CSV and Excel order exports
+ORDER_EXPORT_COLUMNS = ('Order ID', 'User ID', 'Token Number', 'Status', 'Date & Time',
+                        'Item Name', 'Quantity', 'Unit Price', 'Item Total', 'Order Total')
+# Excel shows these columns (Unit Price, Item Total, Order Total) with two decimals
+EXPORT_MONEY_COLUMNS = (7, 8, 9)
+EXPORT_MONEY_FORMAT = '0.00'
 
 # UI Palette - Bright Warm Light (White + Orange/Red)
 PALETTE = {
@@ -101,12 +279,275 @@ PALETTE = {
     "chart_8": "#ffa94d",
 }
 
+# Palette pre-parsed to matplotlib RGB float tuples so chart redraws skip hex parsing
+PALETTE_RGB = {
+    name: tuple(int(hexstr[i:i + 2], 16) / 255 for i in (1, 3, 5))
+    for name, hexstr in PALETTE.items()
+}
+CHART_SERIES_RGB = tuple(PALETTE_RGB[f"chart_{n}"] for n in range(1, 9))
+CHART_TEXT_RGB = PALETTE_RGB["text"]
+CHART_BG_RGB = PALETTE_RGB["panel"]
+CHART_PLOT_BG_RGB = PALETTE_RGB["panel_alt"]
+
+# Named Tk fonts (created once per root in CanteenApp._setup_styles); styles and widgets
+# refer to them by name so Tk resolves each font and caches its metrics only once
+APP_FONTS = {
+    "AppBody": {"family": "Segoe UI", "size": 10},
+    "AppBodyBold": {"family": "Segoe UI", "size": 10, "weight": "bold"},
+    "AppText": {"family": "Segoe UI", "size": 11},
+    "AppHeading": {"family": "Segoe UI", "size": 11, "weight": "bold"},
+    "AppStat": {"family": "Segoe UI", "size": 14, "weight": "bold"},
+    "AppTitle": {"family": "Segoe UI", "size": 16, "weight": "bold"},
+}
+
+# Tk option database entries for what ttk styles cannot reach: the entry widgets' own
+# -font option (a widget option, not a style one) and classic Tk widgets
+TK_OPTIONS = (
+    ("*TEntry.font", "AppBody"),
+    ("*TCombobox.font", "AppBody"),
+    ("*TSpinbox.font", "AppBody"),
+    ("*TCombobox*Listbox.background", PALETTE["input_bg"]),
+    ("*TCombobox*Listbox.foreground", PALETTE["text"]),
+    ("*TCombobox*Listbox.selectBackground", PALETTE["primary"]),
+    ("*TCombobox*Listbox.selectForeground", "#ffffff"),
+    ("*TCombobox*Listbox.font", "AppBody"),
+)
+
+# Solid button styles ("<variant>.TButton"): palette color (its "<color>_hover" entry is
+# used while active), text color, padding
+BUTTON_VARIANTS = {
+    "Primary": ("primary", "#ffffff", (16, 10)),
+    "Accent": ("accent", "#ffffff", (16, 10)),
+    "Danger": ("danger", "#ffffff", (12, 8)),
+    "Success": ("success", "#001b10", (14, 9)),
+    "Warning": ("warning", "#1a0f00", (14, 9)),
+    "Info": ("info", "#00121a", (14, 9)),
+}
+
+# Every ttk style the app uses, in the shape ttk.Style.theme_settings() takes, so the
+# whole theme is applied in one Tcl call instead of a configure()/map() call per style
+TTK_STYLE_SETTINGS = {
+    # Root style: every ttk style inherits this font unless it sets its own
+    ".": {"configure": {"font": "AppBody"}},
+
+    # Frames
+    "Topbar.TFrame": {"configure": {"background": PALETTE["panel"], "relief": "flat"}},
+    "Panel.TFrame": {"configure": {"background": PALETTE["panel"], "relief": "flat"}},
+    "PanelAlt.TFrame": {"configure": {"background": PALETTE["panel_alt"], "relief": "flat"}},
+    "Card.TFrame": {"configure": {"background": PALETTE["panel_alt"], "relief": "flat"}},
+
+    # Labels
+    "TLabel": {"configure": {"background": PALETTE["panel"], "foreground": PALETTE["text"], "font": "AppText"}},
+    "Subtle.TLabel": {"configure": {"background": PALETTE["panel"], "foreground": PALETTE["text_secondary"], "font": "AppBody"}},
+    "Title.TLabel": {"configure": {"background": PALETTE["panel"], "foreground": PALETTE["text"], "font": "AppTitle"}},
+    "FormLabel.TLabel": {"configure": {"background": PALETTE["panel_alt"], "foreground": PALETTE["text"], "font": "AppBody"}},
+
+    # Buttons
+    "TButton": {
+        "configure": {"padding": (12, 8), "font": "AppBodyBold", "foreground": "#ffffff", "borderwidth": 0},
+        "map": {
+            "background": [("active", PALETTE["primary_hover"]), ("!active", PALETTE["primary"])],
+            "relief": [("pressed", "sunken"), ("!pressed", "flat")],
+        },
+    },
+    **{
+        f"{variant}.TButton": {
+            "configure": {"background": PALETTE[color], "foreground": text_color, "padding": padding},
+            "map": {"background": [("active", PALETTE[f"{color}_hover"])]},
+        }
+        for variant, (color, text_color, padding) in BUTTON_VARIANTS.items()
+    },
+    "Ghost.TButton": {
+        "configure": {"background": PALETTE["panel"], "foreground": PALETTE["text"], "relief": "flat", "padding": (10, 6)},
+        "map": {
+            "background": [("active", PALETTE["panel_hover"])],
+            "foreground": [("!active", PALETTE["link"]), ("active", PALETTE["link_hover"])],
+        },
+    },
+
+    # Toasts
+    "ToastInfo.TLabel": {"configure": {"background": PALETTE["info"], "foreground": "#00121a", "font": "AppBodyBold"}},
+    "ToastSuccess.TLabel": {"configure": {"background": PALETTE["success"], "foreground": "#001b10", "font": "AppBodyBold"}},
+    "ToastWarning.TLabel": {"configure": {"background": PALETTE["warning"], "foreground": "#1a0f00", "font": "AppBodyBold"}},
+    "ToastError.TLabel": {"configure": {"background": PALETTE["danger"], "foreground": "#ffffff", "font": "AppBodyBold"}},
+
+    # Entry fields
+    "TEntry": {
+        "configure": {
+            "fieldbackground": PALETTE["input_bg"],
+            "foreground": PALETTE["text"],
+            "borderwidth": 1,
+            "relief": "solid",
+            "padding": 8,
+            "insertcolor": PALETTE["text"],
+        },
+        "map": {
+            "fieldbackground": [("focus", PALETTE["input_focus"]), ("!focus", PALETTE["input_bg"])],
+            "bordercolor": [("focus", PALETTE["border_focus"]), ("!focus", PALETTE["border"])],
+        },
+    },
+
+    # Combobox (its dropdown list is a classic Tk Listbox, themed via TK_OPTIONS)
+    "TCombobox": {
+        "configure": {
+            "fieldbackground": PALETTE["input_bg"],
+            "foreground": PALETTE["text"],
+            "background": PALETTE["panel_alt"],
+            "borderwidth": 1,
+            "relief": "solid",
+            "padding": 8,
+            "arrowcolor": PALETTE["text"],
+        },
+        "map": {
+            "fieldbackground": [("focus", PALETTE["input_focus"]), ("readonly", PALETTE["input_bg"]), ("!focus", PALETTE["input_bg"])],
+            "bordercolor": [("focus", PALETTE["border_focus"]), ("!focus", PALETTE["border"])],
+            "arrowcolor": [("active", PALETTE["text"])],
+            "background": [("readonly", PALETTE["input_bg"])],
+        },
+    },
+
+    # Spinbox
+    "TSpinbox": {
+        "configure": {
+            "fieldbackground": PALETTE["input_bg"],
+            "foreground": PALETTE["text"],
+            "borderwidth": 1,
+            "relief": "solid",
+            "padding": 6,
+            "insertcolor": PALETTE["text"],
+            "arrowcolor": PALETTE["text"],
+        },
+        "map": {
+            "fieldbackground": [("focus", PALETTE["input_focus"]), ("!focus", PALETTE["input_bg"])],
+            "bordercolor": [("focus", PALETTE["border_focus"]), ("!focus", PALETTE["border"])],
+        },
+    },
+
+    # Checkbutton
+    "TCheckbutton": {
+        "configure": {"background": PALETTE["panel_alt"], "foreground": PALETTE["text"]},
+        "map": {"background": [("active", PALETTE["panel_alt"]), ("selected", PALETTE["panel_alt"])]},
+    },
+
+    # Notebook
+    "TNotebook": {"configure": {"background": PALETTE["panel"], "borderwidth": 0, "relief": "flat"}},
+    "TNotebook.Tab": {
+        "configure": {
+            "padding": (18, 10),
+            "font": "AppHeading",
+            "background": PALETTE["panel"],
+            "foreground": PALETTE["text_secondary"],
+            "borderwidth": 0,
+        },
+        "map": {
+            "background": [("selected", PALETTE["accent_alt"]), ("!selected", PALETTE["panel"])],
+            "foreground": [("selected", "#ffffff"), ("!selected", PALETTE["text_secondary"])],
+            "expand": [("selected", [1, 1, 1, 0])],
+        },
+    },
+
+    # Treeview
+    "Treeview": {
+        "configure": {
+            "background": PALETTE["panel"],
+            "fieldbackground": PALETTE["panel"],
+            "foreground": PALETTE["text"],
+            "rowheight": 32,
+            "borderwidth": 0,
+            "relief": "flat",
+        },
+        "map": {
+            "background": [("selected", PALETTE["selection_bg"])],
+            "foreground": [("selected", PALETTE["selection_fg"])],
+        },
+    },
+    "Treeview.Heading": {
+        "configure": {
+            "font": "AppHeading",
+            "background": PALETTE["table_header"],
+            "foreground": PALETTE["text"],
+            "relief": "flat",
+            "borderwidth": 0,
+            "padding": (8, 8),
+        },
+    },
+
+    # Labelframe
+    "TLabelframe": {
+        "configure": {"background": PALETTE["panel"], "relief": "flat", "borderwidth": 1, "bordercolor": PALETTE["border"]},
+    },
+    "TLabelframe.Label": {
+        "configure": {"background": PALETTE["panel"], "foreground": PALETTE["text"], "font": "AppHeading"},
+    },
+}
+
+
+def open_with_default_app(path: str) -> None:
+    """Open a file with the OS default application without waiting for it to exit."""
+    if PLATFORM == 'Windows':
+        os.startfile(path)
+    elif PLATFORM == 'Darwin':  # macOS
+        subprocess.Popen(['open', path])
+    else:  # Linux
+        subprocess.Popen(['xdg-open', path])
+
+
+def configure_zebra_tags(tree: ttk.Treeview) -> None:
+    """Define the "odd"/"even" row tags once, right after the tree is built.
+
+    Loaders pass the tag to insert() so striping costs no extra Tcl calls.
+    """
+    tree.tag_configure("odd", background=PALETTE["row_alt"])
+    tree.tag_configure("even", background=PALETTE.get("row_alt2", PALETTE["panel"]))
+
+
+def sync_tree_rows(tree: ttk.Treeview, rows: list, shown: dict, even_tags: tuple = ("even",)) -> dict:
+    """Make tree display rows, a list of (iid, values) in order, with odd/even zebra tags.
+
+    shown is the map returned by the previous call for this tree (iid -> (values, tags),
+    in display order), so only rows that were added, removed, moved or edited cost a
+    Tcl call. Returns the map to pass next time.
+    """
+    wanted = {iid for iid, _ in rows}
+    stale = [iid for iid in shown if iid not in wanted]
+    if stale:
+        tree.delete(*stale)
+    order = [iid for iid in shown if iid in wanted]  # mirrors the tree's children
+    new_shown = {}
+    for idx, (iid, values) in enumerate(rows):
+        tags = ("odd",) if idx % 2 else even_tags
+        old = shown.get(iid)
+        if old is None:
+            tree.insert("", idx, iid=iid, values=values, tags=tags)
+            order.insert(idx, iid)
+        else:
+            if order[idx] != iid:
+                tree.move(iid, "", idx)
+                order.remove(iid)
+                order.insert(idx, iid)
+            if old != (values, tags):
+                tree.item(iid, values=values, tags=tags)
+        new_shown[iid] = (values, tags)
+    return new_shown
+
+
+def reset_vars(defaults) -> None:
+    """Put each (tk variable, default) pair back to its default.
+
+    Variables already at their default are left alone; set() fires write traces
+    and redisplays every bound widget even when the value is unchanged.
+    """
+    for var, value in defaults:
+        if var.get() != value:
+            var.set(value)
+
 
 def ensure_assets_dir_exists() -> None:
     if not os.path.isdir(ASSETS_DIR):
         os.makedirs(ASSETS_DIR, exist_ok=True)
 
 
+@lru_cache(maxsize=4096)
 def format_datetime(timestamp_str: str) -> str:
     """Format ISO timestamp to user-friendly format."""
     try:
@@ -139,33 +580,91 @@ def calculate_discounted_price(original_price: float, offers: list) -> tuple[flo
     Returns:
         Tuple of (final_price, offer_description) where offer_description is None if no discount
     """
-    if not offers:
+    def offer_discount(offer: dict) -> float:
+        if offer["discount_type"] == "PERCENTAGE":
+            return original_price * (offer["discount_value"] / 100)
+        return offer["discount_value"]  # FIXED
+    
+    # Apply the best offer (highest discount); ties keep the first offer
+    best_offer = max(offers, key=offer_discount, default=None)
+    best_discount = offer_discount(best_offer) if best_offer else 0.0
+    if best_discount <= 0:
         return original_price, None
     
-    # Apply the best offer (highest discount)
-    best_offer = None
-    best_discount = 0.0
+    final_price = max(0.0, original_price - best_discount)
+    return final_price, _offer_description(best_offer)
+
+
+def _offer_description(offer: dict) -> str:
+    if offer["discount_type"] == "PERCENTAGE":
+        return f"{offer['offer_name']}: {offer['discount_value']:.0f}% off"
+    return f"{offer['offer_name']}: Rs {offer['discount_value']:.2f} off"
+
+
+def calculate_discounted_prices(prices: list[float], offers_per_item: list[list]) -> list[tuple[float, str | None]]:
+    """Vectorized calculate_discounted_price for a whole cart.
     
-    for offer in offers:
-        if offer["discount_type"] == "PERCENTAGE":
-            discount = original_price * (offer["discount_value"] / 100)
-        else:  # FIXED
-            discount = offer["discount_value"]
+    Args:
+        prices: Original price of each line
+        offers_per_item: Active offers for each line, aligned with prices
         
-        if discount > best_discount:
-            best_discount = discount
-            best_offer = offer
+    Returns:
+        List of (final_price, offer_description) tuples, one per line
+    """
+    if np is None:
+        return [calculate_discounted_price(p, o) for p, o in zip(prices, offers_per_item)]
     
-    if best_offer:
-        final_price = max(0.0, original_price - best_discount)
-        offer_desc = f"{best_offer['offer_name']}: "
-        if best_offer["discount_type"] == "PERCENTAGE":
-            offer_desc += f"{best_offer['discount_value']:.0f}% off"
-        else:
-            offer_desc += f"Rs {best_offer['discount_value']:.2f} off"
-        return final_price, offer_desc
+    flat = [offer for offers in offers_per_item for offer in offers]
+    if not flat:
+        return [(price, None) for price in prices]
+    
+    n_items = len(prices)
+    price_arr = np.asarray(prices, dtype=np.float64)
+    counts = np.fromiter((len(o) for o in offers_per_item), dtype=np.intp, count=n_items)
+    owner = np.repeat(np.arange(n_items), counts)  # line index for each flat offer
+    values = np.fromiter((o["discount_value"] for o in flat), dtype=np.float64, count=len(flat))
+    is_pct = np.fromiter((o["discount_type"] == "PERCENTAGE" for o in flat), dtype=bool, count=len(flat))
     
-    return original_price, None
+    discounts = np.where(is_pct, price_arr[owner] * (values / 100), values)
+    best = np.zeros(n_items)
+    np.maximum.at(best, owner, discounts)
+    # First offer reaching the best discount wins, as in the scalar version
+    winner = np.full(n_items, len(flat))
+    hits = np.flatnonzero((discounts == best[owner]) & (discounts > 0))
+    np.minimum.at(winner, owner[hits], hits)
+    final = np.where(best > 0, np.maximum(0.0, price_arr - best), price_arr)
+    
+    return [
+        (float(final[i]), _offer_description(flat[winner[i]]) if winner[i] < len(flat) else None)
+        for i in range(n_items)
+    ]
+
+
+def save_qr_png(payload: str, path: str) -> None:
+    """Write payload as a QR code PNG, using segno when installed and qrcode otherwise."""
+    segno = _get_segno()
+    if segno is not None:
+        segno.make(payload, error="m").save(path, scale=6)
+        return
+    qrcode = _get_qrcode()
+    if qrcode is None:
+        raise ImportError("No QR library is installed. Install one with: pip install segno (or: pip install qrcode)")
+    qrcode.make(payload).save(path)
+
+
+def upi_payload(order_id: int, amount: float) -> str:
+    """UPI deep link the student scans to pay for an order."""
+    return f"upi://pay?pa={UPI_ID}&am={amount:.2f}&tn=Canteen%20Order%20{order_id}"
+
+
+def qr_png_path(payload: str) -> str:
+    """Cache path for payload's QR PNG.
+
+    Named after a hash of the payload, so a file left over from a reset database
+    (order ids restart) is never reused for a different amount.
+    """
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return os.path.join(ASSETS_DIR, f"qr_{digest}.png")
 
 
 def generate_receipt_pdf(order_data: dict, user_data: dict, qr_path: str = None) -> str:
@@ -179,7 +678,8 @@ def generate_receipt_pdf(order_data: dict, user_data: dict, qr_path: str = None)
     Returns:
         Path to the generated PDF file
     """
-    if not reportlab_available:
+    rl = _get_reportlab()
+    if rl is None:
         raise ImportError("reportlab library is not installed. Install it with: pip install reportlab")
     
     ensure_assets_dir_exists()
@@ -190,39 +690,14 @@ def generate_receipt_pdf(order_data: dict, user_data: dict, qr_path: str = None)
     pdf_path = os.path.join(ASSETS_DIR, pdf_filename)
     
     # Create PDF document
-    doc = SimpleDocTemplate(pdf_path, pagesize=A4)
+    doc = rl.SimpleDocTemplate(pdf_path, pagesize=rl.A4)
     story = []
     
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1a1f2e'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12,
-        fontName='Helvetica-Bold'
-    )
-    
-    normal_style = styles['Normal']
-    normal_style.fontSize = 10
-    normal_style.leading = 14
-    
     # Header
-    story.append(Paragraph("🍽️ CANTEEN PAYMENT SYSTEM", title_style))
-    story.append(Spacer(1, 0.2*inch))
-    story.append(Paragraph("OFFICIAL RECEIPT", heading_style))
-    story.append(Spacer(1, 0.3*inch))
+    story.append(rl.Paragraph("🍽️ CANTEEN PAYMENT SYSTEM", rl.title_style))
+    story.append(rl.Spacer(1, 0.2*rl.inch))
+    story.append(rl.Paragraph("OFFICIAL RECEIPT", rl.heading_style))
+    story.append(rl.Spacer(1, 0.3*rl.inch))
     
     # Order Information
     order_info_data = [
@@ -232,19 +707,10 @@ def generate_receipt_pdf(order_data: dict, user_data: dict, qr_path: str = None)
         ['Status:', order_data["status"]],
     ]
     
-    order_info_table = Table(order_info_data, colWidths=[2*inch, 4*inch])
-    order_info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-    ]))
+    order_info_table = rl.Table(order_info_data, colWidths=[2*rl.inch, 4*rl.inch])
+    order_info_table.setStyle(rl.info_table_style)
     story.append(order_info_table)
-    story.append(Spacer(1, 0.2*inch))
+    story.append(rl.Spacer(1, 0.2*rl.inch))
     
     # Customer Information
     customer_info_data = [
@@ -252,88 +718,53 @@ def generate_receipt_pdf(order_data: dict, user_data: dict, qr_path: str = None)
         ['Customer ID:', user_data.get("user_id", "N/A")],
     ]
     
-    customer_info_table = Table(customer_info_data, colWidths=[2*inch, 4*inch])
-    customer_info_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#ecf0f1')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-    ]))
-    story.append(Paragraph("Customer Details", heading_style))
+    customer_info_table = rl.Table(customer_info_data, colWidths=[2*rl.inch, 4*rl.inch])
+    customer_info_table.setStyle(rl.info_table_style)
+    story.append(rl.Paragraph("Customer Details", rl.heading_style))
     story.append(customer_info_table)
-    story.append(Spacer(1, 0.2*inch))
+    story.append(rl.Spacer(1, 0.2*rl.inch))
     
     # Items Table
-    story.append(Paragraph("Ordered Items", heading_style))
+    story.append(rl.Paragraph("Ordered Items", rl.heading_style))
     items_data = [['Item Name', 'Quantity', 'Unit Price (Rs)', 'Total (Rs)']]
+    items_data += [
+        [
+            item["item_name"],
+            str(item.get("qty", 1)),
+            f"{float(item['price']):.2f}",
+            f"{float(item['price']) * item.get('qty', 1):.2f}",
+        ]
+        for item in order_data["items"]
+    ]
     
-    for item in order_data["items"]:
-        item_name = item["item_name"]
-        quantity = item.get("qty", 1)
-        unit_price = float(item["price"])
-        total_price = unit_price * quantity
-        items_data.append([
-            item_name,
-            str(quantity),
-            f"{unit_price:.2f}",
-            f"{total_price:.2f}"
-        ])
-    
-    items_table = Table(items_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-    items_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#34495e')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('TOPPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-    ]))
+    items_table = rl.Table(items_data, colWidths=[3*rl.inch, 1*rl.inch, 1.5*rl.inch, 1.5*rl.inch])
+    items_table.setStyle(rl.items_table_style)
     story.append(items_table)
-    story.append(Spacer(1, 0.2*inch))
+    story.append(rl.Spacer(1, 0.2*rl.inch))
     
     # Total Amount
     total_data = [
         ['', '', 'Total Amount:', f"Rs {order_data['total_amount']:.2f}"]
     ]
-    total_table = Table(total_data, colWidths=[3*inch, 1*inch, 1.5*inch, 1.5*inch])
-    total_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-        ('FONTNAME', (2, 0), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (2, 0), (-1, -1), 12),
-        ('TEXTCOLOR', (2, 0), (-1, -1), colors.HexColor('#2c3e50')),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-        ('TOPPADDING', (0, 0), (-1, -1), 10),
-    ]))
+    total_table = rl.Table(total_data, colWidths=[3*rl.inch, 1*rl.inch, 1.5*rl.inch, 1.5*rl.inch])
+    total_table.setStyle(rl.total_table_style)
     story.append(total_table)
-    story.append(Spacer(1, 0.3*inch))
+    story.append(rl.Spacer(1, 0.3*rl.inch))
     
     # QR Code (if available)
     if qr_path and os.path.exists(qr_path):
         try:
-            story.append(Paragraph("Transaction QR Code", heading_style))
-            qr_img = Image(qr_path, width=2*inch, height=2*inch)
+            story.append(rl.Paragraph("Transaction QR Code", rl.heading_style))
+            qr_img = rl.Image(qr_path, width=2*rl.inch, height=2*rl.inch)
             story.append(qr_img)
-            story.append(Spacer(1, 0.2*inch))
+            story.append(rl.Spacer(1, 0.2*rl.inch))
         except Exception:
             pass
     
     # Footer
-    story.append(Spacer(1, 0.3*inch))
-    story.append(Paragraph("Thank you for your order!", normal_style))
-    story.append(Paragraph("This is a computer-generated receipt.", 
-                          ParagraphStyle('Footer', parent=normal_style, fontSize=8, 
-                                       textColor=colors.grey, alignment=TA_CENTER)))
+    story.append(rl.Spacer(1, 0.3*rl.inch))
+    story.append(rl.Paragraph("Thank you for your order!", rl.normal_style))
+    story.append(rl.Paragraph("This is a computer-generated receipt.", rl.footer_style))
     
     # Build PDF
     doc.build(story)
@@ -343,16 +774,96 @@ def generate_receipt_pdf(order_data: dict, user_data: dict, qr_path: str = None)
 class DatabaseHandler:
     """Encapsulates all SQLite operations and reporting queries."""
 
+    # Applied once per connection; WAL lets the UI read while a write is in flight
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-20000",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    # PRAGMA user_version after the one-time order_items backfill in _ensure_db
+    SCHEMA_VERSION = 1
+
     def __init__(self, db_path: str) -> None:
         self.db_path = db_path
+        # One connection per thread: background workers (CanteenApp.executor) read through
+        # their own WAL connection instead of interleaving with the UI thread's transactions
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._write_count = 0  # transactions committed through this handler (see change_stamp)
         self._ensure_db()
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
     def _connect(self):
-        return sqlite3.connect(self.db_path)
+        # Autocommit mode: writes open their own transaction via _transaction()
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        cur = conn.cursor()
+        for pragma in self.PRAGMAS:
+            cur.execute(pragma)
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Yield a cursor inside a BEGIN IMMEDIATE ... COMMIT block on the calling thread's connection."""
+        cur = self._conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+        except BaseException:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+        self._write_count += 1
+
+    def change_stamp(self) -> tuple[int, int]:
+        """A value that differs whenever the database may have changed since it was last taken.
+
+        Covers writes through this handler and, via PRAGMA data_version, commits made by
+        any other connection or process.
+        """
+        return self._write_count, self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    @contextmanager
+    def read_snapshot(self):
+        """Run several reads inside one deferred transaction so they all see the same snapshot."""
+        cur = self._conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            yield
+        finally:
+            cur.execute("COMMIT")
+
+    def close(self) -> None:
+        lock = getattr(self, "_connections_lock", None)
+        if lock is None:
+            return
+        with lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
 
     def _ensure_db(self) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS users (
@@ -402,212 +913,343 @@ class DatabaseHandler:
                 )
                 """
             )
-            conn.commit()
+            # Normalized order lines; orders.items keeps the JSON copy for older readers
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS order_items (
+                    order_id INTEGER NOT NULL,
+                    item_id INTEGER,
+                    item_name TEXT NOT NULL,
+                    qty INTEGER NOT NULL,
+                    unit_price REAL NOT NULL,
+                    FOREIGN KEY (order_id) REFERENCES orders(order_id)
+                )
+                """
+            )
+            # Backfill lines for orders written before order_items existed; runs once, the
+            # version bump commits in the same transaction as the copied rows
+            if cur.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                cur.execute(
+                    """
+                    INSERT INTO order_items(order_id, item_id, item_name, qty, unit_price)
+                    SELECT o.order_id, json_extract(v.value, '$.item_id'), json_extract(v.value, '$.item_name'),
+                           COALESCE(json_extract(v.value, '$.qty'), 1), json_extract(v.value, '$.price')
+                    FROM orders o, json_each(o.items) v
+                    WHERE NOT EXISTS (SELECT 1 FROM order_items oi WHERE oi.order_id = o.order_id)
+                    ORDER BY o.order_id, v.key
+                    """
+                )
+                cur.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            # Indexes for the filtered lookups used by dashboards and token generation
+            cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_orders_token ON orders(token_number)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_status ON orders(status)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_user ON orders(user_id)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_orders_timestamp ON orders(timestamp)")
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS idx_offers_active ON offers(active, item_id, day_of_week)"
+            )
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_order_items_order ON order_items(order_id)")
 
-        # Seed menu if empty
-        if not self.list_menu():
+        # Seed menu if empty (once, at startup)
+        if self._conn.execute("SELECT 1 FROM menu LIMIT 1").fetchone() is None:
             self._seed_menu()
 
+    # (item_name, price, available) rows used to seed an empty menu
+    DEFAULT_MENU_ITEMS = (
+        ("Masala Dosa", 50.0, 1),
+        ("Idli Sambar", 35.0, 1),
+        ("Veg Sandwich", 45.0, 1),
+        ("Pav Bhaji", 70.0, 1),
+        ("Chole Bhature", 80.0, 1),
+        ("Tea", 10.0, 1),
+        ("Coffee", 15.0, 1),
+    )
+
     def _seed_menu(self) -> None:
-        default_items = [
-            ("Masala Dosa", 50.0, 1),
-            ("Idli Sambar", 35.0, 1),
-            ("Veg Sandwich", 45.0, 1),
-            ("Pav Bhaji", 70.0, 1),
-            ("Chole Bhature", 80.0, 1),
-            ("Tea", 10.0, 1),
-            ("Coffee", 15.0, 1),
-        ]
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.executemany(
-                "INSERT OR IGNORE INTO menu(item_name, price, available) VALUES (?, ?, ?)",
-                default_items,
-            )
-            conn.commit()
+        self.bulk_insert_menu(self.DEFAULT_MENU_ITEMS)
 
     # Users
     def get_user(self, user_id: str):
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT user_id, name, role FROM users WHERE user_id = ?", (user_id,))
-            row = cur.fetchone()
-            return {"user_id": row[0], "name": row[1], "role": row[2]} if row else None
+        cur = self._conn.cursor()
+        cur.execute("SELECT user_id, name, role FROM users WHERE user_id = ?", (user_id,))
+        row = cur.fetchone()
+        return dict(row) if row else None
 
     def get_user_by_name_and_id(self, name: str, user_id: str):
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT user_id, name, role FROM users WHERE user_id = ? AND name = ?",
-                (user_id, name),
-            )
-            row = cur.fetchone()
-            return {"user_id": row[0], "name": row[1], "role": row[2]} if row else None
+        cur = self._conn.cursor()
+        cur.execute(
+            "SELECT user_id, name, role FROM users WHERE user_id = ? AND name = ?",
+            (user_id, name),
+        )
+        row = cur.fetchone()
+        return dict(row) if row else None
 
     def create_user(self, user_id: str, name: str, role: str) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute(
                 "INSERT INTO users(user_id, name, role) VALUES (?, ?, ?)",
                 (user_id, name, role),
             )
-            conn.commit()
 
     # Menu
     def list_menu(self):
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT item_id, item_name, price, available FROM menu ORDER BY item_name ASC"
-            )
-            rows = cur.fetchall()
-            return [
-                {"item_id": r[0], "item_name": r[1], "price": r[2], "available": bool(r[3])}
-                for r in rows
-            ]
+        cur = self._conn.cursor()
+        cur.execute(
+            "SELECT item_id, item_name, price, available FROM menu ORDER BY item_name ASC"
+        )
+        return [{**r, "available": bool(r["available"])} for r in cur.fetchall()]
 
     def add_menu_item(self, item_name: str, price: float, available: bool = True) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute(
                 "INSERT INTO menu(item_name, price, available) VALUES (?, ?, ?)",
                 (item_name, price, 1 if available else 0),
             )
-            conn.commit()
+
+    def bulk_insert_menu(self, items: list[tuple[str, float, int]] | tuple[tuple[str, float, int], ...]) -> None:
+        """Insert many (item_name, price, available) rows in a single transaction.
+
+        Names that already exist are skipped. Prefer this over calling
+        add_menu_item() in a loop; every single-row helper commits on its own.
+        """
+        with self._transaction() as cur:
+            cur.executemany(
+                "INSERT OR IGNORE INTO menu(item_name, price, available) VALUES (?, ?, ?)",
+                items,
+            )
 
     def update_menu_item(self, item_id: int, item_name: str, price: float, available: bool) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute(
                 "UPDATE menu SET item_name = ?, price = ?, available = ? WHERE item_id = ?",
                 (item_name, price, 1 if available else 0, item_id),
             )
-            conn.commit()
 
     def delete_menu_item(self, item_id: int) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute("DELETE FROM menu WHERE item_id = ?", (item_id,))
-            conn.commit()
 
     # Orders
+    def _free_tokens(self) -> list[str]:
+        # One query for the used tokens, then everything left in the token space
+        cur = self._conn.cursor()
+        cur.execute("SELECT token_number FROM orders")
+        used = {r[0] for r in cur.fetchall()}
+        return [t for t in TOKEN_SPACE if t not in used]
+
     def _generate_unique_token(self) -> str:
-        with self._connect() as conn:
-            cur = conn.cursor()
-            while True:
-                token = str(random.randint(1000, 9999))
-                cur.execute("SELECT 1 FROM orders WHERE token_number = ?", (token,))
-                if cur.fetchone() is None:
-                    return token
+        free = self._free_tokens()
+        if not free:
+            raise RuntimeError("No free token numbers left")
+        return random.choice(free)
+
+    @staticmethod
+    def _order_item_rows(order_id: int, items: list) -> list[tuple]:
+        return [
+            (order_id, it.get("item_id"), it["item_name"], int(it.get("qty", 1)), float(it["price"]))
+            for it in items
+        ]
+
+    # Random-probe attempts before create_order falls back to scanning for a free token
+    TOKEN_RANDOM_ATTEMPTS = 20
+
+    def _insert_order_row(self, cur, user_id: str, items_json: str, total_amount: float, timestamp: str) -> int:
+        """Insert an orders row, letting SQLite draw the token and the UNIQUE index reject repeats."""
+        for _ in range(self.TOKEN_RANDOM_ATTEMPTS):
+            try:
+                # OR ABORT undoes only this statement on a clash; the transaction stays open
+                cur.execute(
+                    """
+                    INSERT OR ABORT INTO orders(user_id, items, total_amount, token_number, status, timestamp)
+                    VALUES (?, ?, ?, printf('%04d', abs(random() % 9000) + 1000), 'PLACED', ?)
+                    """,
+                    (user_id, items_json, total_amount, timestamp),
+                )
+            except sqlite3.IntegrityError:
+                continue
+            return cur.lastrowid
+        # Token space is nearly full: pick from what is actually left
+        cur.execute(
+            """
+            INSERT INTO orders(user_id, items, total_amount, token_number, status, timestamp)
+            VALUES (?, ?, ?, ?, 'PLACED', ?)
+            """,
+            (user_id, items_json, total_amount, self._generate_unique_token(), timestamp),
+        )
+        return cur.lastrowid
 
     def create_order(self, user_id: str, items: list, total_amount: float) -> int:
-        token = self._generate_unique_token()
         timestamp = dt.datetime.now().isoformat(timespec="seconds")
-        items_json = json.dumps(items)
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO orders(user_id, items, total_amount, token_number, status, timestamp)
-                VALUES (?, ?, ?, ?, 'PLACED', ?)
-                """,
-                (user_id, items_json, total_amount, token, timestamp),
+        items_json = json_dumps(items)
+        with self._transaction() as cur:
+            order_id = self._insert_order_row(cur, user_id, items_json, total_amount, timestamp)
+            cur.executemany(
+                "INSERT INTO order_items(order_id, item_id, item_name, qty, unit_price) VALUES (?, ?, ?, ?, ?)",
+                self._order_item_rows(order_id, items),
+            )
+            return order_id
+
+    def bulk_create_orders(self, orders: list[tuple[str, list, float]]) -> None:
+        """Insert many (user_id, items, total_amount) orders in a single transaction.
+
+        Prefer this over calling create_order() in a loop; every single-row
+        helper commits on its own.
+        """
+        timestamp = dt.datetime.now().isoformat(timespec="seconds")
+        item_rows = []
+        with self._transaction() as cur:
+            # Read free tokens under the write lock so no other writer can take one first
+            free = self._free_tokens()
+            if len(free) < len(orders):
+                raise RuntimeError("No free token numbers left")
+            tokens = random.sample(free, len(orders))
+            for (user_id, items, total_amount), token in zip(orders, tokens):
+                cur.execute(
+                    """
+                    INSERT INTO orders(user_id, items, total_amount, token_number, status, timestamp)
+                    VALUES (?, ?, ?, ?, 'PLACED', ?)
+                    """,
+                    (user_id, json_dumps(items), total_amount, token, timestamp),
+                )
+                item_rows += self._order_item_rows(cur.lastrowid, items)
+            cur.executemany(
+                "INSERT INTO order_items(order_id, item_id, item_name, qty, unit_price) VALUES (?, ?, ?, ?, ?)",
+                item_rows,
             )
-            conn.commit()
-            return cur.lastrowid
 
     def update_order_status(self, order_id: int, status: str) -> None:
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute("UPDATE orders SET status = ? WHERE order_id = ?", (status, order_id))
-            conn.commit()
 
-    def list_orders(self, status: str | None = None):
-        query = "SELECT order_id, user_id, items, total_amount, token_number, status, timestamp FROM orders"
+    # Orders joined with their order_items rows, one result row per item
+    ORDER_SELECT = """
+        SELECT o.order_id, o.user_id, o.total_amount, o.token_number, o.status, o.timestamp,
+               oi.item_id, oi.item_name, oi.unit_price, oi.qty
+        FROM orders o
+        LEFT JOIN order_items oi ON oi.order_id = o.order_id
+    """
+
+    @staticmethod
+    def _collate_orders(rows):
+        """Group joined (order x item) rows back into one dict per order, preserving row order."""
+        for order_id, group in itertools.groupby(rows, key=lambda r: r[0]):
+            group = list(group)
+            r = group[0]
+            yield {
+                "order_id": order_id,
+                "user_id": r[1],
+                "items": [
+                    {"item_id": g[6], "item_name": g[7], "price": g[8], "qty": g[9]}
+                    for g in group
+                    if g[7] is not None
+                ],
+                "total_amount": r[2],
+                "token_number": r[3],
+                "status": r[4],
+                "timestamp": r[5],
+            }
+
+    def iter_orders(self, status: str | None = None, limit: int | None = None, offset: int = 0):
+        """Yield orders one at a time (latest first) without materializing the table.
+
+        limit/offset page over orders, not over the joined item rows.
+        """
+        query = self.ORDER_SELECT
         params: tuple = ()
         if status:
-            query += " WHERE status = ?"
+            query += " WHERE o.status = ?"
             params = (status,)
-        query += " ORDER BY order_id DESC"
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(query, params)
-            rows = cur.fetchall()
-            return [
-                {
-                    "order_id": r[0],
-                    "user_id": r[1],
-                    "items": json.loads(r[2]),
-                    "total_amount": r[3],
-                    "token_number": r[4],
-                    "status": r[5],
-                    "timestamp": r[6],
-                }
-                for r in rows
-            ]
+        if limit is not None:
+            query += " AND" if status else " WHERE"
+            query += " o.order_id IN (SELECT order_id FROM orders"
+            if status:
+                query += " WHERE status = ?"
+                params += (status,)
+            query += " ORDER BY order_id DESC LIMIT ? OFFSET ?)"
+            params += (limit, offset)
+        query += " ORDER BY o.order_id DESC, oi.rowid"
+        cur = self._conn.cursor()
+        cur.execute(query, params)
+        yield from self._collate_orders(cur)
+
+    def list_orders(self, status: str | None = None, limit: int | None = None, offset: int = 0):
+        return list(self.iter_orders(status, limit, offset))
+
+    def get_order(self, order_id: int):
+        cur = self._conn.cursor()
+        cur.execute(self.ORDER_SELECT + " WHERE o.order_id = ? ORDER BY oi.rowid", (order_id,))
+        return next(self._collate_orders(cur), None)
 
     def list_orders_for_user(self, user_id: str):
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT order_id, user_id, items, total_amount, token_number, status, timestamp
-                FROM orders WHERE user_id = ? ORDER BY order_id DESC
-                """,
-                (user_id,),
-            )
-            rows = cur.fetchall()
-            return [
-                {
-                    "order_id": r[0],
-                    "user_id": r[1],
-                    "items": json.loads(r[2]),
-                    "total_amount": r[3],
-                    "token_number": r[4],
-                    "status": r[5],
-                    "timestamp": r[6],
-                }
-                for r in rows
-            ]
+        """All of a user's orders with their items, fetched by one JOIN query.
+
+        Orders still PLACED come first, then the rest; latest first within each group.
+        """
+        cur = self._conn.cursor()
+        cur.execute(
+            self.ORDER_SELECT
+            + " WHERE o.user_id = ? ORDER BY (o.status != 'PLACED'), o.order_id DESC, oi.rowid",
+            (user_id,),
+        )
+        return list(self._collate_orders(cur))
 
     # Reporting
-    def sales_by_item(self):
-        counts: dict[str, int] = {}
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT items FROM orders")
-            for (items_json,) in cur.fetchall():
-                for it in json.loads(items_json):
-                    name = it["item_name"]
-                    qty = int(it.get("qty", 1))
-                    counts[name] = counts.get(name, 0) + qty
-        return counts
+    def order_summary(self) -> dict:
+        """Order counts and total revenue in one aggregate query (pending = not yet COMPLETED)."""
+        cur = self._conn.cursor()
+        cur.execute(
+            "SELECT COUNT(*), COALESCE(SUM(status = 'COMPLETED'), 0), COALESCE(SUM(total_amount), 0.0) FROM orders"
+        )
+        total, completed, revenue = cur.fetchone()
+        return {"orders": total, "pending": total - completed, "completed": completed, "revenue": float(revenue)}
+
+    def sales_by_item(self, limit: int | None = None):
+        """Quantity sold per item name, best sellers first (ties by name); `limit` keeps the top N."""
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            SELECT item_name, SUM(qty) AS sold
+            FROM order_items
+            GROUP BY item_name
+            ORDER BY sold DESC, item_name
+            LIMIT ?
+            """,
+            (-1 if limit is None else limit,),
+        )
+        return {name: qty for name, qty in cur.fetchall()}
 
     def orders_per_hour(self):
         buckets = {h: 0 for h in range(24)}
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT timestamp FROM orders")
-            for (ts,) in cur.fetchall():
-                try:
-                    dt_obj = dt.datetime.fromisoformat(ts)
-                    buckets[dt_obj.hour] += 1
-                except Exception:
-                    pass
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            SELECT CAST(strftime('%H', timestamp) AS INTEGER) AS hour, COUNT(*)
+            FROM orders
+            WHERE strftime('%H', timestamp) IS NOT NULL
+            GROUP BY hour
+            """
+        )
+        buckets.update(cur.fetchall())
         return buckets
 
-    def revenue_per_day(self):
-        totals: dict[str, float] = {}
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT total_amount, timestamp FROM orders")
-            for amount, ts in cur.fetchall():
-                try:
-                    d = dt.datetime.fromisoformat(ts).date().isoformat()
-                except Exception:
-                    d = ts.split("T")[0]
-                totals[d] = round(totals.get(d, 0.0) + float(amount), 2)
-        return totals
+    def revenue_per_day(self, limit: int | None = None):
+        """Revenue per day, oldest first; `limit` keeps only the most recent N days."""
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            SELECT day, total FROM (
+                SELECT COALESCE(date(timestamp), substr(timestamp, 1, instr(timestamp || 'T', 'T') - 1)) AS day,
+                       ROUND(SUM(total_amount), 2) AS total
+                FROM orders
+                GROUP BY day
+                ORDER BY day DESC
+                LIMIT ?
+            )
+            ORDER BY day
+            """,
+            (-1 if limit is None else limit,),
+        )
+        return {day: total for day, total in cur.fetchall()}
 
     # Offers Management
     def create_offer(self, offer_name: str, item_id: int | None, discount_type: str, 
@@ -615,8 +1257,7 @@ class DatabaseHandler:
                      end_date: str | None = None, day_of_week: str | None = None, 
                      active: bool = True) -> int:
         """Create a new offer."""
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute(
                 """
                 INSERT INTO offers(offer_name, item_id, discount_type, discount_value, 
@@ -626,46 +1267,29 @@ class DatabaseHandler:
                 (offer_name, item_id, discount_type, discount_value, start_date, 
                  end_date, day_of_week, 1 if active else 0),
             )
-            conn.commit()
             return cur.lastrowid
 
     def list_offers(self):
         """List all offers with menu item names."""
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT o.offer_id, o.offer_name, o.item_id, m.item_name, o.discount_type,
-                       o.discount_value, o.start_date, o.end_date, o.day_of_week, o.active
-                FROM offers o
-                LEFT JOIN menu m ON o.item_id = m.item_id
-                ORDER BY o.offer_id DESC
-                """
-            )
-            rows = cur.fetchall()
-            return [
-                {
-                    "offer_id": r[0],
-                    "offer_name": r[1],
-                    "item_id": r[2],
-                    "item_name": r[3] if r[3] else "All Items",
-                    "discount_type": r[4],
-                    "discount_value": r[5],
-                    "start_date": r[6],
-                    "end_date": r[7],
-                    "day_of_week": r[8],
-                    "active": bool(r[9]),
-                }
-                for r in rows
-            ]
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            SELECT o.offer_id, o.offer_name, o.item_id,
+                   COALESCE(m.item_name, 'All Items') AS item_name, o.discount_type,
+                   o.discount_value, o.start_date, o.end_date, o.day_of_week, o.active
+            FROM offers o
+            LEFT JOIN menu m ON o.item_id = m.item_id
+            ORDER BY o.offer_id DESC
+            """
+        )
+        return [{**r, "active": bool(r["active"])} for r in cur.fetchall()]
 
     def update_offer(self, offer_id: int, offer_name: str, item_id: int | None,
                      discount_type: str, discount_value: float, 
                      start_date: str | None = None, end_date: str | None = None,
                      day_of_week: str | None = None, active: bool = True) -> None:
         """Update an existing offer."""
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute(
                 """
                 UPDATE offers 
@@ -676,53 +1300,115 @@ class DatabaseHandler:
                 (offer_name, item_id, discount_type, discount_value, start_date, 
                  end_date, day_of_week, 1 if active else 0, offer_id),
             )
-            conn.commit()
 
     def delete_offer(self, offer_id: int) -> None:
         """Delete an offer."""
-        with self._connect() as conn:
-            cur = conn.cursor()
+        with self._transaction() as cur:
             cur.execute("DELETE FROM offers WHERE offer_id = ?", (offer_id,))
-            conn.commit()
+
+    @staticmethod
+    def _offer_window() -> tuple[str, str]:
+        """Today's ISO date and weekday code (MON, TUE, ...) for matching offers."""
+        now = dt.datetime.now()
+        return now.date().isoformat(), now.strftime("%a").upper()
+
+    def list_menu_with_active_offers(self) -> list[dict]:
+        """List the menu with each item's active offers attached, in a single query."""
+        current_date, current_day = self._offer_window()
+        cur = self._conn.cursor()
+        cur.execute(
+            """
+            SELECT m.item_id, m.item_name, m.price, m.available,
+                   o.offer_id, o.offer_name, o.item_id AS offer_item_id, o.discount_type,
+                   o.discount_value, o.start_date, o.end_date, o.day_of_week
+            FROM menu m
+            LEFT JOIN offers o
+              ON o.active = 1
+             AND (o.item_id = m.item_id OR o.item_id IS NULL)
+             AND (o.start_date IS NULL OR o.start_date <= ?)
+             AND (o.end_date IS NULL OR o.end_date >= ?)
+             AND (o.day_of_week IS NULL OR o.day_of_week = ?)
+            ORDER BY m.item_name ASC, m.item_id, o.offer_id
+            """,
+            (current_date, current_date, current_day),
+        )
+        menu = []
+        for item_id, group in itertools.groupby(cur.fetchall(), key=lambda r: r["item_id"]):
+            group = list(group)
+            first = group[0]
+            menu.append({
+                "item_id": item_id,
+                "item_name": first["item_name"],
+                "price": first["price"],
+                "available": bool(first["available"]),
+                "offers": [
+                    {
+                        "offer_id": r["offer_id"],
+                        "offer_name": r["offer_name"],
+                        "item_id": r["offer_item_id"],
+                        "discount_type": r["discount_type"],
+                        "discount_value": r["discount_value"],
+                        "start_date": r["start_date"],
+                        "end_date": r["end_date"],
+                        "day_of_week": r["day_of_week"],
+                    }
+                    for r in group
+                    if r["offer_id"] is not None
+                ],
+            })
+        return menu
 
     def get_active_offers_for_item(self, item_id: int) -> list:
         """Get all active offers applicable to a specific item at current date/time."""
-        now = dt.datetime.now()
-        current_date = now.date().isoformat()
-        current_day = now.strftime("%a").upper()  # MON, TUE, WED, etc.
-        
-        with self._connect() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT offer_id, offer_name, item_id, discount_type, discount_value,
-                       start_date, end_date, day_of_week
-                FROM offers
-                WHERE active = 1
-                AND (item_id = ? OR item_id IS NULL)
-                AND (start_date IS NULL OR start_date <= ?)
-                AND (end_date IS NULL OR end_date >= ?)
-                AND (day_of_week IS NULL OR day_of_week = ?)
-                """,
-                (item_id, current_date, current_date, current_day),
-            )
-            rows = cur.fetchall()
-            return [
-                {
-                    "offer_id": r[0],
-                    "offer_name": r[1],
-                    "item_id": r[2],
-                    "discount_type": r[3],
-                    "discount_value": r[4],
-                    "start_date": r[5],
-                    "end_date": r[6],
-                    "day_of_week": r[7],
-                }
-                for r in rows
-            ]
-
-
-def export_orders_to_csv(db: DatabaseHandler, filepath: str = None) -> str:
+        return self.get_active_offers_for_items([item_id])[item_id]
+
+    # The item ids travel as one JSON array parameter, so the SQL text (and sqlite3's
+    # cached prepared statement) is the same whatever the cart size
+    ACTIVE_OFFERS_FOR_ITEMS_SQL = """
+        SELECT offer_id, offer_name, item_id, discount_type, discount_value,
+               start_date, end_date, day_of_week
+        FROM offers
+        WHERE active = 1
+        AND (item_id IN (SELECT value FROM json_each(?)) OR item_id IS NULL)
+        AND (start_date IS NULL OR start_date <= ?)
+        AND (end_date IS NULL OR end_date >= ?)
+        AND (day_of_week IS NULL OR day_of_week = ?)
+        ORDER BY offer_id
+    """
+
+    def get_active_offers_for_items(self, item_ids: list[int]) -> dict[int, list]:
+        """Get active offers for several items in one query, keyed by item_id.
+
+        Offers without an item_id apply to every requested item.
+        """
+        offers_by_item: dict[int, list] = {item_id: [] for item_id in item_ids}
+        if not item_ids:
+            return offers_by_item
+        current_date, current_day = self._offer_window()
+        cur = self._conn.cursor()
+        cur.execute(
+            self.ACTIVE_OFFERS_FOR_ITEMS_SQL,
+            (json_dumps(list(offers_by_item)), current_date, current_date, current_day),
+        )
+        for r in cur.fetchall():
+            offer = dict(r)
+            if offer["item_id"] is None:
+                for offers in offers_by_item.values():
+                    offers.append(offer)
+            else:
+                offers_by_item[offer["item_id"]].append(offer)
+        return offers_by_item
+
+
+def _csv_field(value) -> str:
+    """Render a value the way csv.writer does with its default QUOTE_MINIMAL dialect."""
+    text = str(value)
+    if any(c in text for c in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def export_orders_to_csv(db: DatabaseHandler, filepath: str = None) -> tuple[str, int]:
     """Export all orders to CSV format.
     
     Args:
@@ -730,7 +1416,7 @@ def export_orders_to_csv(db: DatabaseHandler, filepath: str = None) -> str:
         filepath: Optional file path, if None will generate timestamped filename
         
     Returns:
-        Path to the generated CSV file
+        (path to the generated CSV file, number of orders exported)
     """
     ensure_assets_dir_exists()
     
@@ -738,59 +1424,152 @@ def export_orders_to_csv(db: DatabaseHandler, filepath: str = None) -> str:
         timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
         filepath = os.path.join(ASSETS_DIR, f"orders_export_{timestamp}.csv")
     
-    orders = db.list_orders()
+    # Fields are pre-quoted with the same rules as csv.writer (QUOTE_MINIMAL), so each
+    # (order x item) row can be joined and written straight into a large file buffer
+    order_count = 0
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+        write = csvfile.write
+        write(",".join(_csv_field(c) for c in ORDER_EXPORT_COLUMNS) + "\r\n")
+        for order_count, order in enumerate(db.iter_orders(), start=1):
+            order_prefix = (
+                f"{order['order_id']},{_csv_field(order['user_id'])},"
+                f"{_csv_field(order['token_number'])},{_csv_field(order['status'])},"
+                f"{_csv_field(format_datetime(order['timestamp']))},"
+            )
+            order_total = f"{order['total_amount']:.2f}"
+            for item in order["items"]:
+                qty = item.get("qty", 1)
+                price = item["price"]
+                write(
+                    f"{order_prefix}{_csv_field(item['item_name'])},{qty},"
+                    f"{price:.2f},{price * qty:.2f},{order_total}\r\n"
+                )
     
-    # Prepare data for CSV
-    csv_data = []
+    return filepath, order_count
+
+
+def _iter_export_rows(orders):
+    """Yield one tuple per (order x item) in ORDER_EXPORT_COLUMNS order.
+
+    Prices and totals are REAL columns, so they already arrive as floats.
+
+    Paired with DatabaseHandler.iter_orders() this keeps exports at constant
+    memory: no list of rows is built before handing them to a writer.
+    """
     for order in orders:
-        # Expand items into separate rows
-        items = order["items"]
-        for idx, item in enumerate(items):
-            row = {
-                'Order ID': order["order_id"],
-                'User ID': order["user_id"],
-                'Token Number': order["token_number"],
-                'Status': order["status"],
-                'Date & Time': format_datetime(order["timestamp"]),
-                'Item Name': item["item_name"],
-                'Quantity': item.get("qty", 1),
-                'Unit Price': f"{float(item['price']):.2f}",
-                'Item Total': f"{float(item['price']) * item.get('qty', 1):.2f}",
-                'Order Total': f"{order['total_amount']:.2f}",
-            }
-            csv_data.append(row)
-    
-    # Write CSV file
-    if csv_data:
-        fieldnames = ['Order ID', 'User ID', 'Token Number', 'Status', 'Date & Time', 
-                     'Item Name', 'Quantity', 'Unit Price', 'Item Total', 'Order Total']
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(csv_data)
-    else:
-        # Create empty CSV with headers
-        fieldnames = ['Order ID', 'User ID', 'Token Number', 'Status', 'Date & Time', 
-                     'Item Name', 'Quantity', 'Unit Price', 'Item Total', 'Order Total']
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-    
-    return filepath
+        formatted_time = format_datetime(order["timestamp"])
+        order_total = order['total_amount']
+        for item in order["items"]:
+            qty = item.get("qty", 1)
+            price = item['price']
+            yield (
+                order["order_id"],
+                order["user_id"],
+                order["token_number"],
+                order["status"],
+                formatted_time,
+                item["item_name"],
+                qty,
+                price,
+                price * qty,
+                order_total,
+            )
+
 
+def _write_orders_xlsxwriter(db: DatabaseHandler, filepath: str) -> int:
+    """Write export rows with xlsxwriter in constant_memory mode (rows are flushed as written).
 
-def export_orders_to_excel(db: DatabaseHandler, filepath: str = None) -> str:
-    """Export all orders to Excel format using pandas.
+    Returns the number of orders written.
+    """
+    workbook = xlsxwriter.Workbook(filepath, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Orders')
+    header_format = workbook.add_format({
+        'bold': True,
+        'font_color': '#FFFFFF',
+        'bg_color': '#366092',
+        'align': 'center',
+        'valign': 'vcenter',
+    })
+    money_format = workbook.add_format({'num_format': EXPORT_MONEY_FORMAT})
+    # Column formats must be in place before constant_memory flushes the first data row
+    col_formats = [money_format if c in EXPORT_MONEY_COLUMNS else None for c in range(len(ORDER_EXPORT_COLUMNS))]
+    for col_idx, col_format in enumerate(col_formats):
+        if col_format is not None:
+            worksheet.set_column(col_idx, col_idx, None, col_format)
+    worksheet.write_row(0, 0, ORDER_EXPORT_COLUMNS, header_format)
+    widths = [len(c) for c in ORDER_EXPORT_COLUMNS]
+    row_idx = 0
+    order_count = 0
+    for order_count, order in enumerate(db.iter_orders(), start=1):
+        for row in _iter_export_rows((order,)):
+            row_idx += 1
+            worksheet.write_row(row_idx, 0, row)
+            for i, v in enumerate(row):
+                widths[i] = max(widths[i], len(str(v)))
+    for col_idx, (width, col_format) in enumerate(zip(widths, col_formats)):
+        worksheet.set_column(col_idx, col_idx, min(width + 2, 50), col_format)
+    workbook.close()
+    return order_count
+
+
+def _write_orders_openpyxl(db: DatabaseHandler, filepath: str) -> int:
+    """Write export rows with openpyxl's write-only workbook (rows are streamed to disk).
+
+    Column widths must be set before the first row is appended, so the orders
+    are read twice: once to measure the columns and once to write them. Both
+    passes run in one read snapshot so they see the same orders.
+    Returns the number of orders written.
+    """
+    xl = _get_openpyxl()
+
+    with db.read_snapshot():
+        widths = [len(c) for c in ORDER_EXPORT_COLUMNS]
+        order_count = 0
+        for order_count, order in enumerate(db.iter_orders(), start=1):
+            for row in _iter_export_rows((order,)):
+                for i, v in enumerate(row):
+                    widths[i] = max(widths[i], len(str(v)))
+
+        workbook = xl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Orders')
+        for col_idx, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[xl.get_column_letter(col_idx)].width = min(width + 2, 50)
+
+        # One registered style for the header row instead of setting fill/font/alignment per cell
+        workbook.add_named_style(xl.header_style)
+        header = []
+        for title in ORDER_EXPORT_COLUMNS:
+            cell = xl.WriteOnlyCell(worksheet, value=title)
+            cell.style = xl.header_style.name
+            header.append(cell)
+        worksheet.append(header)
+
+        for row in _iter_export_rows(db.iter_orders()):
+            row = list(row)
+            for col_idx in EXPORT_MONEY_COLUMNS:
+                cell = xl.WriteOnlyCell(worksheet, value=row[col_idx])
+                cell.number_format = EXPORT_MONEY_FORMAT
+                row[col_idx] = cell
+            worksheet.append(row)
+    workbook.save(filepath)
+    return order_count
+
+
+def export_orders_to_excel(db: DatabaseHandler, filepath: str = None) -> tuple[str, int]:
+    """Export all orders to Excel format.
+    
+    Uses xlsxwriter's streaming mode when installed, otherwise openpyxl's
+    write-only mode (slower; kept only so exports work without xlsxwriter).
     
     Args:
         db: DatabaseHandler instance
         filepath: Optional file path, if None will generate timestamped filename
         
     Returns:
-        Path to the generated Excel file
+        (path to the generated Excel file, number of orders exported)
     """
-    if not pandas_available:
-        raise ImportError("pandas library is not installed. Install it with: pip install pandas openpyxl")
+    if not (xlsxwriter_available or openpyxl_available):
+        raise ImportError("xlsxwriter library is not installed. Install it with: pip install xlsxwriter")
     
     ensure_assets_dir_exists()
     
@@ -798,68 +1577,23 @@ def export_orders_to_excel(db: DatabaseHandler, filepath: str = None) -> str:
         timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
         filepath = os.path.join(ASSETS_DIR, f"orders_export_{timestamp}.xlsx")
     
-    orders = db.list_orders()
-    
-    # Prepare data for Excel
-    excel_data = []
-    for order in orders:
-        # Expand items into separate rows
-        items = order["items"]
-        for item in items:
-            row = {
-                'Order ID': order["order_id"],
-                'User ID': order["user_id"],
-                'Token Number': order["token_number"],
-                'Status': order["status"],
-                'Date & Time': format_datetime(order["timestamp"]),
-                'Item Name': item["item_name"],
-                'Quantity': item.get("qty", 1),
-                'Unit Price': float(item['price']),
-                'Item Total': float(item['price']) * item.get('qty', 1),
-                'Order Total': float(order['total_amount']),
-            }
-            excel_data.append(row)
-    
-    # Create DataFrame and export to Excel
-    if excel_data:
-        df = pd.DataFrame(excel_data)
+    if xlsxwriter_available:
+        order_count = _write_orders_xlsxwriter(db, filepath)
     else:
-        # Create empty DataFrame with headers
-        df = pd.DataFrame(columns=['Order ID', 'User ID', 'Token Number', 'Status', 'Date & Time', 
-                                   'Item Name', 'Quantity', 'Unit Price', 'Item Total', 'Order Total'])
+        order_count = _write_orders_openpyxl(db, filepath)
     
-    # Write to Excel with formatting
-    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Orders', index=False)
-        
-        # Get the workbook and worksheet for formatting
-        workbook = writer.book
-        worksheet = writer.sheets['Orders']
-        
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        # Format header row
-        from openpyxl.styles import Font, PatternFill, Alignment
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF")
-        
-        for cell in worksheet[1]:
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-    
-    return filepath
+    return filepath, order_count
+
+
+@dataclass(slots=True)
+class CartLine:
+    """One line of the student's cart; field order matches the stored order item JSON."""
+    item_id: int
+    item_name: str
+    price: float
+    original_price: float
+    offer_desc: str | None
+    qty: int
 
 
 class Order:
@@ -868,9 +1602,14 @@ class Order:
     def __init__(self, db: DatabaseHandler) -> None:
         self.db = db
 
-    def create(self, user_id: str, cart_items: list[dict]) -> int:
-        total = sum(float(i["price"]) * int(i["qty"]) for i in cart_items)
-        return self.db.create_order(user_id=user_id, items=cart_items, total_amount=round(total, 2))
+    def create(self, user_id: str, cart_items) -> int:
+        # One walk over any iterable of item dicts builds the list create_order needs and the total
+        items = []
+        total = 0.0
+        for i in cart_items:
+            items.append(i)
+            total += float(i["price"]) * int(i["qty"])
+        return self.db.create_order(user_id=user_id, items=items, total_amount=round(total, 2))
 
 
 class LoginWindow(ttk.Frame):
@@ -981,11 +1720,15 @@ class LoginWindow(ttk.Frame):
 
 
 class StudentDashboard(ttk.Frame):
+    # Seconds a cached list of active offers is trusted before re-querying
+    OFFER_CACHE_TTL = 30.0
+
     def __init__(self, parent, app, db: DatabaseHandler):
         super().__init__(parent)
         self.app = app
         self.db = db
-        self.cart: dict[int, dict] = {}
+        self.cart: dict[int, CartLine] = {}
+        self._offer_cache: dict[int, tuple[float, list]] = {}
         self.notebook = ttk.Notebook(self)
         self.menu_tab = ttk.Frame(self.notebook, style="Panel.TFrame")
         self.orders_tab = ttk.Frame(self.notebook, style="Panel.TFrame")
@@ -1012,6 +1755,7 @@ class StudentDashboard(ttk.Frame):
         columns = ("item", "price", "available")
         self.menu_tree = ttk.Treeview(menu_frame, columns=columns, show="headings", height=12,
                                       yscrollcommand=menu_scroll_y.set, xscrollcommand=menu_scroll_x.set)
+        configure_zebra_tags(self.menu_tree)
         self.menu_tree.heading("item", text="Item")
         self.menu_tree.heading("price", text="Price")
         self.menu_tree.heading("available", text="Available")
@@ -1047,6 +1791,7 @@ class StudentDashboard(ttk.Frame):
         
         self.cart_tree = ttk.Treeview(cart_frame, columns=("item", "qty", "price", "discount", "total"), show="headings", height=10,
                                       yscrollcommand=cart_scroll_y.set, xscrollcommand=cart_scroll_x.set)
+        configure_zebra_tags(self.cart_tree)
         for col, text, anchor, width in [
             ("item", "Item", "w", 150),
             ("qty", "Qty", "center", 50),
@@ -1070,9 +1815,10 @@ class StudentDashboard(ttk.Frame):
         total_bar.pack(fill=tk.X, pady=6)
         self.total_var = tk.StringVar(value="0.00")
         ttk.Label(total_bar, text="Total: ").pack(side=tk.LEFT)
-        ttk.Label(total_bar, textvariable=self.total_var, font=("Segoe UI", 11, "bold")).pack(side=tk.LEFT)
+        ttk.Label(total_bar, textvariable=self.total_var, font="AppHeading").pack(side=tk.LEFT)
         ttk.Button(total_bar, text="₹ Pay", style="Primary.TButton", command=self._checkout).pack(side=tk.RIGHT)
         ttk.Button(total_bar, text="⟲ Clear", style="Ghost.TButton", command=self._clear_cart).pack(side=tk.RIGHT, padx=6)
+        ttk.Button(total_bar, text="Refresh Offers", style="Ghost.TButton", command=self._refresh_offers).pack(side=tk.RIGHT, padx=6)
 
         self._load_menu()
 
@@ -1099,6 +1845,7 @@ class StudentDashboard(ttk.Frame):
             yscrollcommand=orders_scroll_y.set,
             xscrollcommand=orders_scroll_x.set
         )
+        configure_zebra_tags(self.orders_tree)
         for col, text, anchor, width in [
             ("order", "Order ID", "center", 80),
             ("token", "Token", "center", 70),
@@ -1125,13 +1872,32 @@ class StudentDashboard(ttk.Frame):
         self._load_orders()
 
     def _load_menu(self):
-        for i in self.menu_tree.get_children():
-            self.menu_tree.delete(i)
-        for m in self.db.list_menu():
+        self._reset_tree(self.menu_tree)
+        # Menu and its currently active offers come back in one query
+        now = time.monotonic()
+        self._offer_cache.clear()
+        for idx, m in enumerate(self.db.list_menu_with_active_offers()):
+            self._offer_cache[m["item_id"]] = (now, m["offers"])
             avail = "Yes" if m["available"] else "No"
-            self.menu_tree.insert("", tk.END, iid=str(m["item_id"]), values=(m["item_name"], f"{m['price']:.2f}", avail))
-        # zebra
-        self._zebra_tree(self.menu_tree)
+            self.menu_tree.insert("", tk.END, iid=str(m["item_id"]), values=(m["item_name"], f"{m['price']:.2f}", avail),
+                                  tags=("odd",) if idx % 2 else ())
+
+    def _offers_for(self, item_ids) -> dict[int, list]:
+        """Active offers per item, served from the cache while fresh and fetched in one query otherwise."""
+        now = time.monotonic()
+        offers_by_item = {}
+        stale = []
+        for item_id in item_ids:
+            entry = self._offer_cache.get(item_id)
+            if entry and now - entry[0] < self.OFFER_CACHE_TTL:
+                offers_by_item[item_id] = entry[1]
+            else:
+                stale.append(item_id)
+        if stale:
+            for item_id, offers in self.db.get_active_offers_for_items(stale).items():
+                self._offer_cache[item_id] = (now, offers)
+                offers_by_item[item_id] = offers
+        return offers_by_item
 
     def _add_to_cart(self):
         selected = self.menu_tree.focus()
@@ -1144,65 +1910,71 @@ class StudentDashboard(ttk.Frame):
         item_name = vals[0]
         original_price = float(vals[1])
         
-        # Check for active offers
-        offers = self.db.get_active_offers_for_item(item_id)
+        offers = self._offers_for([item_id])[item_id]
         discounted_price, offer_desc = calculate_discounted_price(original_price, offers)
         
         existing = self.cart.get(item_id)
         if existing:
-            existing["qty"] += qty
-            # Recalculate discount in case offers changed
-            offers = self.db.get_active_offers_for_item(item_id)
-            discounted_price, offer_desc = calculate_discounted_price(original_price, offers)
-            existing["price"] = discounted_price
-            existing["original_price"] = original_price
-            existing["offer_desc"] = offer_desc
+            existing.qty += qty
+            existing.price = discounted_price
+            existing.original_price = original_price
+            existing.offer_desc = offer_desc
         else:
-            self.cart[item_id] = {
-                "item_id": item_id, 
-                "item_name": item_name, 
-                "price": discounted_price,
-                "original_price": original_price,
-                "offer_desc": offer_desc,
-                "qty": qty
-            }
-        self._refresh_cart()
-
-    def _refresh_cart(self):
-        for i in self.cart_tree.get_children():
-            self.cart_tree.delete(i)
+            self.cart[item_id] = CartLine(
+                item_id=item_id,
+                item_name=item_name,
+                price=discounted_price,
+                original_price=original_price,
+                offer_desc=offer_desc,
+                qty=qty,
+            )
+        # Priced at add time above; other lines keep their prices until checkout or "Refresh Offers"
+        self._redraw_cart()
+
+    def _reprice_cart(self):
+        """Re-price every cart line against the currently active offers, then redraw."""
+        lines = list(self.cart.values())
+        offers_by_item = self._offers_for(self.cart)
+        priced = calculate_discounted_prices(
+            [it.original_price for it in lines], [offers_by_item[it.item_id] for it in lines]
+        )
+        for it, (discounted_price, offer_desc) in zip(lines, priced):
+            it.price = discounted_price
+            it.offer_desc = offer_desc
+        self._redraw_cart()
+
+    def _refresh_offers(self):
+        """Drop cached offers and re-price the cart (e.g. after a manager changed an offer)."""
+        self._offer_cache.clear()
+        self._reprice_cart()
+
+    def _redraw_cart(self):
+        """Redraw the cart from the prices already stored on each line; no DB access."""
+        self._reset_tree(self.cart_tree)
         total = 0.0
-        for it in self.cart.values():
-            # Recalculate discount in case offers changed
-            offers = self.db.get_active_offers_for_item(it["item_id"])
-            original_price = it.get("original_price", it["price"])
-            discounted_price, offer_desc = calculate_discounted_price(original_price, offers)
-            it["price"] = discounted_price
-            it["original_price"] = original_price
-            it["offer_desc"] = offer_desc
-            
-            line_total = float(it["price"]) * int(it["qty"])
+        for idx, it in enumerate(self.cart.values()):
+            line_total = it.price * it.qty
             total += line_total
             
             # Format discount display
-            discount_display = offer_desc if offer_desc else "-"
+            discount_display = it.offer_desc or "-"
             
             self.cart_tree.insert(
-                "", tk.END, iid=str(it["item_id"]), 
+                "", tk.END, iid=str(it.item_id), 
                 values=(
-                    it["item_name"], 
-                    it["qty"], 
-                    f"{it['price']:.2f}", 
+                    it.item_name, 
+                    it.qty, 
+                    f"{it.price:.2f}", 
                     discount_display,
                     f"{line_total:.2f}"
-                )
+                ),
+                tags=("odd",) if idx % 2 else (),
             )
         self.total_var.set(f"{total:.2f}")
-        self._zebra_tree(self.cart_tree)
 
     def _clear_cart(self):
         self.cart.clear()
-        self._refresh_cart()
+        self._redraw_cart()
 
     def _checkout(self):
         if not self.cart:
@@ -1212,8 +1984,9 @@ class StudentDashboard(ttk.Frame):
         if not user:
             messagebox.showerror("Not logged in", "Please login again")
             return
-        items = list(self.cart.values())
-        order_id = Order(self.db).create(user_id=user["user_id"], cart_items=items)
+        # Charge current offer prices: refetch offers rather than trust the cache (up to OFFER_CACHE_TTL old)
+        self._refresh_offers()
+        order_id = Order(self.db).create(user_id=user["user_id"], cart_items=map(asdict, self.cart.values()))
         total = float(self.total_var.get())
         self._show_qr_modal(order_id, total)
         self._clear_cart()
@@ -1221,25 +1994,29 @@ class StudentDashboard(ttk.Frame):
         self._load_orders()
 
     def _show_qr_modal(self, order_id: int, amount: float):
-        if qrcode is None:
-            messagebox.showinfo("QR", "Install 'qrcode' to generate QR codes: pip install qrcode[pil]")
+        if not (segno_available or qrcode_available):
+            messagebox.showinfo("QR", "Install 'segno' (or 'qrcode') to generate QR codes: pip install segno")
             return
         ensure_assets_dir_exists()
-        upi_payload = f"upi://pay?pa={UPI_ID}&am={amount:.2f}&tn=Canteen%20Order%20{order_id}"
-        img = qrcode.make(upi_payload)
-        qr_path = os.path.join(ASSETS_DIR, f"qr_order_{order_id}.png")
-        img.save(qr_path)
+        payload = upi_payload(order_id, amount)
+        qr_path = qr_png_path(payload)
+        # The file name is derived from the payload, so an existing file is already this QR
+        if not os.path.exists(qr_path):
+            save_qr_png(payload, qr_path)
 
         top = tk.Toplevel(self)
         top.title("Scan to Pay")
         top.geometry("360x420")
-        ttk.Label(top, text=f"Order #{order_id} | Amount: Rs {amount:.2f}", font=("Segoe UI", 10, "bold")).pack(pady=8)
+        ttk.Label(top, text=f"Order #{order_id} | Amount: Rs {amount:.2f}", font="AppBodyBold").pack(pady=8)
 
-        try:
-            from PIL import Image, ImageTk  # optional for better sizing
-            im = Image.open(qr_path).resize((300, 300))
-            photo = ImageTk.PhotoImage(im)
-        except Exception:
+        pil = _get_pil()  # optional for better sizing
+        photo = None
+        if pil is not None:
+            try:
+                photo = pil.ImageTk.PhotoImage(pil.Image.open(qr_path).resize((300, 300)))
+            except Exception:
+                pass  # Undecodable for Pillow; Tk's own PNG loader below may still read it
+        if photo is None:
             photo = tk.PhotoImage(file=qr_path)
 
         lbl = ttk.Label(top, image=photo)
@@ -1252,11 +2029,18 @@ class StudentDashboard(ttk.Frame):
         user = self.app.current_user
         if not user:
             return
-        for i in self.orders_tree.get_children():
-            self.orders_tree.delete(i)
-        data = self.db.list_orders_for_user(user["user_id"]) or []
-        current_first = sorted(data, key=lambda d: (d["status"] != "PLACED", -d["order_id"]))
-        for o in current_first:
+        self.app.run_in_background(
+            lambda: self.db.list_orders_for_user(user["user_id"]),
+            lambda data: self._show_orders(user, data),
+            "Failed to load orders",
+        )
+
+    def _show_orders(self, user: dict, data: list[dict]):
+        if self.app.current_user is not user:
+            return  # Logged out (or in as someone else) while the query ran
+        self._reset_tree(self.orders_tree)
+        # Already current-first (PLACED orders on top) from the query
+        for idx, o in enumerate(data):
             # Format the timestamp to a user-friendly format
             formatted_time = format_datetime(o["timestamp"])
             self.orders_tree.insert(
@@ -1264,8 +2048,8 @@ class StudentDashboard(ttk.Frame):
                 tk.END,
                 iid=str(o["order_id"]),
                 values=(o["order_id"], o["token_number"], o["status"], f"{o['total_amount']:.2f}", formatted_time),
+                tags=("odd",) if idx % 2 else (),
             )
-        self._zebra_tree(self.orders_tree)
 
     def _download_receipt(self):
         """Download PDF receipt for the selected completed order."""
@@ -1280,13 +2064,10 @@ class StudentDashboard(ttk.Frame):
             messagebox.showerror("Error", "User session expired. Please login again.")
             return
         
-        # Get order data
-        orders = self.db.list_orders_for_user(user["user_id"])
-        order_data = None
-        for o in orders:
-            if o["order_id"] == order_id:
-                order_data = o
-                break
+        # Get order data (only the user's own orders count)
+        order_data = self.db.get_order(order_id)
+        if order_data and order_data["user_id"] != user["user_id"]:
+            order_data = None
         
         if not order_data:
             messagebox.showerror("Error", "Order not found")
@@ -1308,7 +2089,7 @@ class StudentDashboard(ttk.Frame):
         
         try:
             # Check for QR code
-            qr_path = os.path.join(ASSETS_DIR, f"qr_order_{order_id}.png")
+            qr_path = qr_png_path(upi_payload(order_id, order_data["total_amount"]))
             if not os.path.exists(qr_path):
                 qr_path = None
             
@@ -1317,12 +2098,7 @@ class StudentDashboard(ttk.Frame):
             
             # Open the PDF file
             try:
-                if platform.system() == 'Windows':
-                    os.startfile(pdf_path)
-                elif platform.system() == 'Darwin':  # macOS
-                    subprocess.call(['open', pdf_path])
-                else:  # Linux
-                    subprocess.call(['xdg-open', pdf_path])
+                open_with_default_app(pdf_path)
             except Exception:
                 # If auto-open fails, just show success message
                 pass
@@ -1334,17 +2110,20 @@ class StudentDashboard(ttk.Frame):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate receipt:\n{str(e)}")
 
-    def _zebra_tree(self, tree: ttk.Treeview) -> None:
-        tree.tag_configure("odd", background=PALETTE["row_alt"]) 
-        for idx, iid in enumerate(tree.get_children("")):
-            tree.item(iid, tags=("odd",) if idx % 2 else ())
+    def _reset_tree(self, tree: ttk.Treeview) -> None:
+        """Drop all rows in one call; callers tag rows "odd" as they insert them for zebra striping."""
+        tree.delete(*tree.get_children())
 
 
 class AttendantDashboard(ttk.Frame):
+    # Orders shown per page; older orders are reached with the Older/Newer buttons
+    ORDERS_PAGE_SIZE = 200
+
     def __init__(self, parent, app, db: DatabaseHandler):
         super().__init__(parent)
         self.app = app
         self.db = db
+        self._orders_offset = 0
         self._build()
 
     def _build(self):
@@ -1355,6 +2134,10 @@ class AttendantDashboard(ttk.Frame):
         ttk.Button(top, text="✔ Completed", style="Primary.TButton", command=lambda: self._update_status("COMPLETED")).pack(side=tk.LEFT, padx=6)
         # Add logout button for easy visibility
         ttk.Button(top, text="🚪 Logout", style="Danger.TButton", command=self.app._logout).pack(side=tk.RIGHT, padx=6)
+        self.older_btn = ttk.Button(top, text="Older ›", style="Ghost.TButton", command=lambda: self._page_orders(1))
+        self.older_btn.pack(side=tk.RIGHT, padx=6)
+        self.newer_btn = ttk.Button(top, text="‹ Newer", style="Ghost.TButton", command=lambda: self._page_orders(-1))
+        self.newer_btn.pack(side=tk.RIGHT, padx=6)
 
         # Orders tree with scrollbar
         orders_frame = ttk.Frame(self, style="Panel.TFrame")
@@ -1366,6 +2149,7 @@ class AttendantDashboard(ttk.Frame):
         columns = ("order", "token", "items", "total", "status", "time")
         self.orders_tree = ttk.Treeview(orders_frame, columns=columns, show="headings", height=16,
                                         yscrollcommand=orders_scroll_y.set, xscrollcommand=orders_scroll_x.set)
+        configure_zebra_tags(self.orders_tree)
         for col, text, anchor, width in [
             ("order", "Order ID", "center", 70),
             ("token", "Token", "center", 70),
@@ -1400,6 +2184,8 @@ class AttendantDashboard(ttk.Frame):
         
         self.menu_tree = ttk.Treeview(tree_frame, columns=("name", "price", "avail"), show="headings", height=8,
                                       yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        configure_zebra_tags(self.menu_tree)
+        self._menu_shown: dict = {}
         self.menu_tree.heading("name", text="Name")
         self.menu_tree.heading("price", text="Price")
         self.menu_tree.heading("avail", text="Available")
@@ -1426,6 +2212,7 @@ class AttendantDashboard(ttk.Frame):
         ttk.Entry(menuf, textvariable=self.m_price, width=10).grid(row=1, column=3, padx=4, pady=4)
         self.m_avail = tk.BooleanVar(value=True)
         ttk.Checkbutton(menuf, text="Available", variable=self.m_avail).grid(row=1, column=4, padx=4, pady=4)
+        self._menu_form_defaults = ((self.m_name, ""), (self.m_price, ""), (self.m_avail, True))
         
         # Buttons beside input fields
         ttk.Button(menuf, text="＋ Add", style="Accent.TButton", command=self._add_menu).grid(row=1, column=5, padx=2, pady=4)
@@ -1442,19 +2229,31 @@ class AttendantDashboard(ttk.Frame):
         menuf.columnconfigure(0, weight=0)
         menuf.columnconfigure(1, weight=1)
         menuf.rowconfigure(0, weight=1)
-        
-        # Load menu immediately when dashboard is built
-        self._load_menu()
 
     def on_show(self):
         self._refresh()
         self._load_menu()
 
+    def reset_paging(self):
+        """Go back to the newest page of orders (called on logout)."""
+        self._orders_offset = 0
+
     def _refresh(self):
-        for i in self.orders_tree.get_children():
-            self.orders_tree.delete(i)
-        orders = self.db.list_orders()  # all orders, latest first
-        for o in orders:
+        # One page of orders, latest first
+        offset = self._orders_offset
+        self.app.run_in_background(
+            lambda: self.db.list_orders(limit=self.ORDERS_PAGE_SIZE, offset=offset),
+            lambda orders: self._show_orders(offset, orders),
+            "Failed to load orders",
+        )
+
+    def _show_orders(self, offset: int, orders: list[dict]):
+        if offset != self._orders_offset:
+            return  # Paged again while the query ran; that newer load will fill the tree
+        self._reset_tree(self.orders_tree)
+        self.newer_btn.state(["!disabled"] if self._orders_offset else ["disabled"])
+        self.older_btn.state(["!disabled"] if len(orders) == self.ORDERS_PAGE_SIZE else ["disabled"])
+        for idx, o in enumerate(orders):
             items_str = ", ".join(f"{it['item_name']} x{it['qty']}" for it in o["items"])[:80]
             # Format the timestamp to a user-friendly format
             formatted_time = format_datetime(o["timestamp"])
@@ -1463,8 +2262,12 @@ class AttendantDashboard(ttk.Frame):
                 tk.END,
                 iid=str(o["order_id"]),
                 values=(o["order_id"], o["token_number"], items_str, f"{o['total_amount']:.2f}", o["status"], formatted_time),
+                tags=("odd",) if idx % 2 else ("even",),
             )
-        self._zebra_tree(self.orders_tree)
+
+    def _page_orders(self, step: int):
+        self._orders_offset = max(0, self._orders_offset + step * self.ORDERS_PAGE_SIZE)
+        self._refresh()
 
     def _update_status(self, status: str):
         sel = self.orders_tree.focus()
@@ -1475,49 +2278,28 @@ class AttendantDashboard(ttk.Frame):
         self._refresh()
 
     def _load_menu(self):
-        for i in self.menu_tree.get_children():
-            self.menu_tree.delete(i)
         menu_items = self.db.list_menu()
-        # If menu is empty, seed default items
-        if not menu_items:
-            # Re-seed menu if empty
-            default_items = [
-                ("Masala Dosa", 50.0, 1),
-                ("Idli Sambar", 35.0, 1),
-                ("Veg Sandwich", 45.0, 1),
-                ("Pav Bhaji", 70.0, 1),
-                ("Chole Bhature", 80.0, 1),
-                ("Tea", 10.0, 1),
-                ("Coffee", 15.0, 1),
-            ]
-            for name, price, avail in default_items:
-                try:
-                    self.db.add_menu_item(name, price, bool(avail))
-                except sqlite3.IntegrityError:
-                    pass  # Item already exists
-            menu_items = self.db.list_menu()
-        for m in menu_items:
-            self.menu_tree.insert("", tk.END, iid=str(m["item_id"]), values=(m["item_name"], f"{m['price']:.2f}", "Yes" if m["available"] else "No"))
-        self._zebra_tree(self.menu_tree)
+        # Rows keyed by tree iid so the handlers below never read back the formatted cells
+        self._menu_by_id = {str(m["item_id"]): m for m in menu_items}
+        rows = [
+            (iid, (m["item_name"], f"{m['price']:.2f}", "Yes" if m["available"] else "No"))
+            for iid, m in self._menu_by_id.items()
+        ]
+        self._menu_shown = sync_tree_rows(self.menu_tree, rows, self._menu_shown)
     
     def _on_menu_select(self, event):
         """Populate form fields when a menu item is selected."""
         sel = self.menu_tree.focus()
         if sel:
-            values = self.menu_tree.item(sel, "values")
-            self.m_name.set(values[0])  # Name
-            self.m_price.set(values[1])  # Price
-            # Set availability checkbox based on "Yes"/"No"
-            self.m_avail.set(values[2] == "Yes")
+            row = self._menu_by_id[sel]
+            self.m_name.set(row["item_name"])
+            self.m_price.set(f"{row['price']:.2f}")
+            self.m_avail.set(row["available"])
     
     def _clear_form(self):
         """Clear all form fields."""
-        self.m_name.set("")
-        self.m_price.set("")
-        self.m_avail.set(True)
-        # Clear selection in tree
-        for item in self.menu_tree.selection():
-            self.menu_tree.selection_remove(item)
+        reset_vars(self._menu_form_defaults)
+        self.menu_tree.selection_remove(self.menu_tree.selection())
 
     def _add_menu(self):
         try:
@@ -1527,32 +2309,28 @@ class AttendantDashboard(ttk.Frame):
             if not name:
                 raise ValueError("Name required")
         except Exception as e:
-            messagebox.showerror("Invalid", f"{e}")
+            self.app.show_toast(f"{e}", "error")
             return
         try:
             self.db.add_menu_item(name, price, avail)
             self._load_menu()
-            self.m_name.set("")
-            self.m_price.set("")
-            self.m_avail.set(True)
+            reset_vars(self._menu_form_defaults)
         except sqlite3.IntegrityError:
-            messagebox.showerror("Exists", "Item with this name already exists")
+            self.app.show_toast("Item with this name already exists", "error")
 
     def _update_item(self):
         """Update both price and availability of the selected menu item."""
         sel = self.menu_tree.focus()
         if not sel:
-            messagebox.showwarning("Select", "Select a menu item to update")
+            self.app.show_toast("Select a menu item to update", "warning")
             return
         
-        # Get current values
-        current_values = self.menu_tree.item(sel, "values")
-        current_name = current_values[0]
+        current_name = self._menu_by_id[sel]["item_name"]
         
         # Get new price from input field
         new_price_str = self.m_price.get().strip()
         if not new_price_str:
-            messagebox.showwarning("Missing", "Enter a price in the Price field")
+            self.app.show_toast("Enter a price in the Price field", "warning")
             return
         
         try:
@@ -1560,7 +2338,7 @@ class AttendantDashboard(ttk.Frame):
             if new_price < 0:
                 raise ValueError("Price cannot be negative")
         except ValueError as e:
-            messagebox.showerror("Invalid Price", f"Please enter a valid price.\n{str(e)}")
+            self.app.show_toast(f"Please enter a valid price.\n{str(e)}", "error")
             return
         
         # Get new availability from checkbox
@@ -1569,30 +2347,26 @@ class AttendantDashboard(ttk.Frame):
         
         # Update the item
         self.db.update_menu_item(int(sel), current_name, new_price, new_avail)
-        messagebox.showinfo("Updated", f"'{current_name}' updated:\nPrice: Rs {new_price:.2f}\nStatus: {status_text}")
+        self.app.show_toast(f"'{current_name}' updated:\nPrice: Rs {new_price:.2f}\nStatus: {status_text}", "success")
         self._load_menu()
         # Clear form fields
-        self.m_name.set("")
-        self.m_price.set("")
-        self.m_avail.set(True)
+        reset_vars(self._menu_form_defaults)
 
     def _update_price(self):
         """Update the price of the selected menu item."""
         sel = self.menu_tree.focus()
         if not sel:
-            messagebox.showwarning("Select", "Select a menu item to update")
+            self.app.show_toast("Select a menu item to update", "warning")
             return
         
-        # Get current values
-        current_values = self.menu_tree.item(sel, "values")
-        current_name = current_values[0]
-        current_price = current_values[1]
-        current_avail = current_values[2] == "Yes"
+        row = self._menu_by_id[sel]
+        current_name = row["item_name"]
+        current_avail = row["available"]
         
         # Get new price from input field
         new_price_str = self.m_price.get().strip()
         if not new_price_str:
-            messagebox.showwarning("Missing", "Enter a new price in the Price field")
+            self.app.show_toast("Enter a new price in the Price field", "warning")
             return
         
         try:
@@ -1600,30 +2374,27 @@ class AttendantDashboard(ttk.Frame):
             if new_price < 0:
                 raise ValueError("Price cannot be negative")
         except ValueError as e:
-            messagebox.showerror("Invalid Price", f"Please enter a valid price.\n{str(e)}")
+            self.app.show_toast(f"Please enter a valid price.\n{str(e)}", "error")
             return
         
         # Update the item
         self.db.update_menu_item(int(sel), current_name, new_price, current_avail)
-        messagebox.showinfo("Updated", f"Price updated to Rs {new_price:.2f}")
+        self.app.show_toast(f"Price updated to Rs {new_price:.2f}", "success")
         self._load_menu()
         # Clear form fields
-        self.m_name.set("")
-        self.m_price.set("")
-        self.m_avail.set(True)
+        reset_vars(self._menu_form_defaults)
     
     def _toggle_availability(self):
         """Toggle the availability status of the selected menu item."""
         sel = self.menu_tree.focus()
         if not sel:
-            messagebox.showwarning("Select", "Select a menu item to toggle availability")
+            self.app.show_toast("Select a menu item to toggle availability", "warning")
             return
         
-        # Get current values
-        current_values = self.menu_tree.item(sel, "values")
-        current_name = current_values[0]
-        current_price = float(current_values[1])
-        current_avail = current_values[2] == "Yes"
+        row = self._menu_by_id[sel]
+        current_name = row["item_name"]
+        current_price = row["price"]
+        current_avail = row["available"]
         
         # Toggle availability
         new_avail = not current_avail
@@ -1631,87 +2402,117 @@ class AttendantDashboard(ttk.Frame):
         
         # Update the item
         self.db.update_menu_item(int(sel), current_name, current_price, new_avail)
-        messagebox.showinfo("Updated", f"'{current_name}' is now {status_text}")
+        self.app.show_toast(f"'{current_name}' is now {status_text}", "success")
         self._load_menu()
         # Clear form fields
-        self.m_name.set("")
-        self.m_price.set("")
-        self.m_avail.set(True)
+        reset_vars(self._menu_form_defaults)
 
     def _delete_menu(self):
         sel = self.menu_tree.focus()
         if not sel:
-            messagebox.showwarning("Select", "Select a menu item")
+            self.app.show_toast("Select a menu item", "warning")
             return
         if messagebox.askyesno("Confirm", "Delete selected item?"):
             self.db.delete_menu_item(int(sel))
             self._load_menu()
     
-    def _zebra_tree(self, tree: ttk.Treeview) -> None:
-        """Apply zebra striping to treeview rows."""
-        tree.tag_configure("odd", background=PALETTE["row_alt"]) 
-        tree.tag_configure("even", background=PALETTE.get("row_alt2", PALETTE["panel"])) 
-        for idx, iid in enumerate(tree.get_children("")):
-            tree.item(iid, tags=("odd",) if idx % 2 else ("even",))
+    def _reset_tree(self, tree: ttk.Treeview) -> None:
+        """Drop all rows in one call; callers tag rows "odd"/"even" as they insert them for zebra striping."""
+        tree.delete(*tree.get_children())
 
 
 class GraphGenerator:
+    # Fixed subplot margins (figure fractions) instead of a tight_layout() solve on every draw;
+    # the bottom margins leave room for the 30-degree item names and dates
+    TOP_ITEMS_MARGINS = dict(left=0.12, right=0.97, top=0.86, bottom=0.34)
+    ORDERS_BY_HOUR_MARGINS = dict(left=0.12, right=0.97, top=0.83, bottom=0.23)
+    REVENUE_MARGINS = dict(left=0.14, right=0.97, top=0.83, bottom=0.32)
+
     def __init__(self, db: DatabaseHandler):
         self.db = db
 
-    def most_selling_items_figure(self) -> Figure:
-        counts = self.db.sales_by_item()
-        items = sorted(counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        labels = [i[0] for i in items]
-        values = [i[1] for i in items]
-        fig = Figure(figsize=(5.5, 3.0), dpi=100)
+    # Data methods only query and sort, so they may run on a worker thread;
+    # the *_figure methods build Matplotlib objects and belong on the Tk thread.
+    def top_selling_items(self) -> tuple[list, list]:
+        counts = self.db.sales_by_item(limit=10)
+        return list(counts), list(counts.values())
+
+    def orders_by_hour(self) -> tuple[list, list]:
+        buckets = self.db.orders_per_hour()
+        hours = list(range(24))
+        return hours, [buckets.get(h, 0) for h in hours]
+
+    def revenue_last_days(self) -> tuple[list, list]:
+        totals = self.db.revenue_per_day(limit=10)
+        return list(totals), list(totals.values())
+
+    def chart_data(self) -> dict:
+        return {
+            "top_items": self.top_selling_items(),
+            "orders_by_hour": self.orders_by_hour(),
+            "revenue_per_day": self.revenue_last_days(),
+        }
+
+    def most_selling_items_figure(self, data: tuple[list, list] | None = None) -> "Figure":
+        fig = _get_matplotlib().Figure(figsize=(5.5, 3.0), dpi=100)
+        self.draw_most_selling_items(fig, data if data is not None else self.top_selling_items())
+        return fig
+
+    def draw_most_selling_items(self, fig: "Figure", data: tuple[list, list]) -> None:
+        labels, values = data
         ax = fig.add_subplot(111)
-        palette_keys = ["chart_1","chart_2","chart_3","chart_4","chart_5","chart_6","chart_7","chart_8"]
-        colors = [PALETTE.get(palette_keys[i % len(palette_keys)], PALETTE["primary"]) for i in range(len(labels))]
+        colors = [CHART_SERIES_RGB[i % len(CHART_SERIES_RGB)] for i in range(len(labels))]
         ax.bar(labels, values, color=colors)
-        ax.set_title("Top Selling Items", color=PALETTE["text"], fontsize=12, fontweight="bold", pad=10)
-        ax.set_ylabel("Qty", color=PALETTE["text"])
-        ax.tick_params(axis='x', rotation=30, colors=PALETTE["text"])
-        ax.tick_params(axis='y', colors=PALETTE["text"])
-        fig.tight_layout()
+        ax.set_title("Top Selling Items", color=CHART_TEXT_RGB, fontsize=12, fontweight="bold", pad=10)
+        ax.set_ylabel("Qty", color=CHART_TEXT_RGB)
+        ax.tick_params(axis='x', rotation=30, colors=CHART_TEXT_RGB)
+        ax.tick_params(axis='y', colors=CHART_TEXT_RGB)
+        fig.subplots_adjust(**self.TOP_ITEMS_MARGINS)
+
+    def orders_per_time_figure(self, data: tuple[list, list] | None = None) -> "Figure":
+        fig = _get_matplotlib().Figure(figsize=(5.5, 2.5), dpi=100)
+        self.draw_orders_per_time(fig, data if data is not None else self.orders_by_hour())
         return fig
 
-    def orders_per_time_figure(self) -> Figure:
-        buckets = self.db.orders_per_hour()
-        hours = list(range(24))
-        values = [buckets.get(h, 0) for h in hours]
-        fig = Figure(figsize=(5.5, 2.5), dpi=100)
+    def draw_orders_per_time(self, fig: "Figure", data: tuple[list, list]) -> None:
+        hours, values = data
         ax = fig.add_subplot(111)
-        ax.plot(hours, values, marker="o", color=PALETTE.get("chart_3", PALETTE["accent"]), linewidth=2, markersize=6)
-        ax.set_title("Orders by Hour", color=PALETTE["text"], fontsize=12, fontweight="bold", pad=10)
-        ax.set_xlabel("Hour", color=PALETTE["text"])
-        ax.set_ylabel("Orders", color=PALETTE["text"])
+        ax.plot(hours, values, marker="o", color=PALETTE_RGB["chart_3"], linewidth=2, markersize=6)
+        ax.set_title("Orders by Hour", color=CHART_TEXT_RGB, fontsize=12, fontweight="bold", pad=10)
+        ax.set_xlabel("Hour", color=CHART_TEXT_RGB)
+        ax.set_ylabel("Orders", color=CHART_TEXT_RGB)
         ax.set_xticks(list(range(0, 24, 2)))
-        ax.tick_params(colors=PALETTE["text"])
-        fig.tight_layout()
+        ax.tick_params(colors=CHART_TEXT_RGB)
+        fig.subplots_adjust(**self.ORDERS_BY_HOUR_MARGINS)
+
+    def revenue_per_day_figure(self, data: tuple[list, list] | None = None) -> "Figure":
+        fig = _get_matplotlib().Figure(figsize=(5.5, 2.5), dpi=100)
+        self.draw_revenue_per_day(fig, data if data is not None else self.revenue_last_days())
         return fig
 
-    def revenue_per_day_figure(self) -> Figure:
-        totals = self.db.revenue_per_day()
-        labels = sorted(totals.keys())[-10:]
-        values = [totals[d] for d in labels]
-        fig = Figure(figsize=(5.5, 2.5), dpi=100)
+    def draw_revenue_per_day(self, fig: "Figure", data: tuple[list, list]) -> None:
+        labels, values = data
         ax = fig.add_subplot(111)
-        ax.bar(labels, values, color=PALETTE.get("chart_4", PALETTE["primary_alt"]))
-        ax.set_title("Revenue per Day (Last 10)", color=PALETTE["text"], fontsize=12, fontweight="bold", pad=10)
-        ax.set_ylabel("Rs", color=PALETTE["text"])
-        ax.tick_params(axis='x', rotation=30, colors=PALETTE["text"])
-        ax.tick_params(axis='y', colors=PALETTE["text"])
-        fig.tight_layout()
-        return fig
+        ax.bar(labels, values, color=PALETTE_RGB["chart_4"])
+        ax.set_title("Revenue per Day (Last 10)", color=CHART_TEXT_RGB, fontsize=12, fontweight="bold", pad=10)
+        ax.set_ylabel("Rs", color=CHART_TEXT_RGB)
+        ax.tick_params(axis='x', rotation=30, colors=CHART_TEXT_RGB)
+        ax.tick_params(axis='y', colors=CHART_TEXT_RGB)
+        fig.subplots_adjust(**self.REVENUE_MARGINS)
 
 
 class ManagerDashboard(ttk.Frame):
+    # Refresh requests arriving within this window (ms) share a single reload
+    REFRESH_DEBOUNCE_MS = 150
+
     def __init__(self, parent, app, db: DatabaseHandler):
         super().__init__(parent)
         self.app = app
         self.db = db
         self.graphs = GraphGenerator(db)
+        self._chart_canvases: dict[str, object] = {}  # chart key -> FigureCanvasTkAgg
+        self._chart_sig: dict[str, int] = {}
+        self._refresh_pending = False
         self._build()
 
     def _build(self):
@@ -1743,7 +2544,7 @@ class ManagerDashboard(ttk.Frame):
 
         btns = ttk.Frame(self.dashboard_tab, style="Panel.TFrame")
         btns.pack(fill=tk.X, padx=8)
-        ttk.Button(btns, text="⟳ Refresh", style="Ghost.TButton", command=self._refresh_all).pack(side=tk.LEFT)
+        ttk.Button(btns, text="⟳ Refresh", style="Ghost.TButton", command=self._schedule_refresh).pack(side=tk.LEFT)
         ttk.Button(btns, text="📊 Export to CSV", style="Accent.TButton", command=self._export_csv).pack(side=tk.LEFT, padx=6)
         ttk.Button(btns, text="📈 Export to Excel", style="Primary.TButton", command=self._export_excel).pack(side=tk.LEFT, padx=6)
         # Add logout button for easy visibility
@@ -1751,68 +2552,99 @@ class ManagerDashboard(ttk.Frame):
 
         self.fig_frame = ttk.Frame(self.dashboard_tab, style="Panel.TFrame")
         self.fig_frame.pack(fill=tk.BOTH, expand=True)
-        self._render_figures()
+        # Charts are drawn by the first background refresh (on_show), not while building the tab
+        self._chart_placeholder = ttk.Label(self.fig_frame, text="Loading charts…")
+        self._chart_placeholder.pack(pady=12)
 
     def _badge(self, parent, col, title, var):
         box = ttk.Labelframe(parent, text=title)
         box.grid(row=0, column=col, sticky="ew", padx=6)
-        ttk.Label(box, textvariable=var, font=("Segoe UI", 14, "bold")).pack(padx=10, pady=10)
+        ttk.Label(box, textvariable=var, font="AppStat").pack(padx=10, pady=10)
 
-    def _render_figures(self):
-        for w in self.fig_frame.winfo_children():
-            w.destroy()
-        if FigureCanvasTkAgg is None:
-            ttk.Label(self.fig_frame, text="Matplotlib backend not available.").pack(pady=12)
+    def _render_figures(self, chart_data: dict | None):
+        """Draw chart_data from _collect_dashboard_data (None when matplotlib is not installed)."""
+        mpl = _get_matplotlib() if matplotlib_available else None
+        if mpl is None or mpl.FigureCanvasTkAgg is None:
+            self._chart_placeholder.configure(text="Matplotlib backend not available.")
             return
-        figs = []
-        # Harmonize chart background with app theme
-        for f in [
-            self.graphs.most_selling_items_figure(),
-            self.graphs.orders_per_time_figure(),
-            self.graphs.revenue_per_day_figure(),
-        ]:
-            f.patch.set_facecolor(PALETTE["panel"]) 
-            for ax in f.axes:
-                ax.set_facecolor(PALETTE["panel_alt"]) 
-                ax.spines["top"].set_visible(False)
-                ax.spines["right"].set_visible(False)
-                ax.tick_params(colors=PALETTE["text"]) 
-                ax.yaxis.label.set_color(PALETTE["text"]) 
-                if ax.xaxis.label:
-                    ax.xaxis.label.set_color(PALETTE["text"]) 
-                ax.title.set_color(PALETTE["text"]) 
-            figs.append(f)
-        for fig in figs:
-            canvas = FigureCanvasTkAgg(fig, master=self.fig_frame)
-            canvas.draw()
-            widget = canvas.get_tk_widget()
-            widget.pack(fill=tk.X, padx=8, pady=6)
+        if self._chart_placeholder.winfo_manager():
+            self._chart_placeholder.pack_forget()
+        # Canvases are created once and redrawn in place, and only when their data changed
+        for key, new_figure, draw in (
+            ("top_items", self.graphs.most_selling_items_figure, self.graphs.draw_most_selling_items),
+            ("orders_by_hour", self.graphs.orders_per_time_figure, self.graphs.draw_orders_per_time),
+            ("revenue_per_day", self.graphs.revenue_per_day_figure, self.graphs.draw_revenue_per_day),
+        ):
+            labels, values = chart_data[key]
+            sig = hash((tuple(labels), tuple(values)))
+            canvas = self._chart_canvases.get(key)
+            if canvas is not None and self._chart_sig.get(key) == sig:
+                continue
+            if canvas is None:
+                fig = new_figure(chart_data[key])
+            else:
+                fig = canvas.figure
+                fig.clear()
+                draw(fig, chart_data[key])
+            self._theme_figure(fig)
+            if canvas is None:
+                canvas = mpl.FigureCanvasTkAgg(fig, master=self.fig_frame)
+                canvas.get_tk_widget().pack(fill=tk.X, padx=8, pady=6)
+                self._chart_canvases[key] = canvas
+            # Let Tk paint on its next idle pass rather than blocking this callback
+            canvas.draw_idle()
+            self._chart_sig[key] = sig
+
+    @staticmethod
+    def _theme_figure(fig: "Figure") -> None:
+        """Harmonize chart background with app theme (text colors are set by the draw_* methods)."""
+        fig.patch.set_facecolor(CHART_BG_RGB)
+        for ax in fig.axes:
+            ax.set_facecolor(CHART_PLOT_BG_RGB)
+            ax.spines["top"].set_visible(False)
+            ax.spines["right"].set_visible(False)
 
     def on_show(self):
-        self._refresh_all()
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.after(self.REFRESH_DEBOUNCE_MS, self._refresh_all)
 
     def _refresh_all(self):
-        pending = len([o for o in self.db.list_orders() if o["status"] != "COMPLETED"])
-        completed = len([o for o in self.db.list_orders("COMPLETED")])
-        revenue = sum(float(o["total_amount"]) for o in self.db.list_orders())
-        self.pending_var.set(str(pending))
-        self.completed_var.set(str(completed))
-        self.revenue_var.set(f"{revenue:.2f}")
-        self._render_figures()
+        self._refresh_pending = False
+        # SQL and sorting run on the app's worker pool; the result is applied on the Tk thread
+        self.app.run_in_background(
+            self._collect_dashboard_data,
+            lambda result: self._apply_refresh(*result),
+            "Failed to load dashboard data",
+        )
+
+    def _collect_dashboard_data(self) -> tuple[dict, dict | None]:
+        # One read transaction: totals and all three charts come from the same snapshot
+        with self.db.read_snapshot():
+            return self.db.order_summary(), self.graphs.chart_data() if matplotlib_available else None
+
+    def _apply_refresh(self, summary: dict, chart_data: dict | None):
+        self.pending_var.set(str(summary["pending"]))
+        self.completed_var.set(str(summary["completed"]))
+        self.revenue_var.set(f"{summary['revenue']:.2f}")
+        self._render_figures(chart_data)
     
     def _export_csv(self):
         """Export all orders to CSV format."""
         try:
-            filepath = export_orders_to_csv(self.db)
+            filepath, order_count = export_orders_to_csv(self.db)
             
             # Open the file location
             try:
-                if platform.system() == 'Windows':
+                if PLATFORM == 'Windows':
                     subprocess.Popen(f'explorer /select,"{filepath}"')
-                elif platform.system() == 'Darwin':  # macOS
-                    subprocess.call(['open', '-R', filepath])
+                elif PLATFORM == 'Darwin':  # macOS
+                    subprocess.Popen(['open', '-R', filepath])
                 else:  # Linux
-                    subprocess.call(['xdg-open', os.path.dirname(filepath)])
+                    subprocess.Popen(['xdg-open', os.path.dirname(filepath)])
             except Exception:
                 pass
             
@@ -1820,29 +2652,24 @@ class ManagerDashboard(ttk.Frame):
                               f"Orders exported to CSV successfully!\n\n"
                               f"File: {os.path.basename(filepath)}\n"
                               f"Location: {ASSETS_DIR}\n\n"
-                              f"Total orders exported: {len(self.db.list_orders())}")
+                              f"Total orders exported: {order_count}")
         except Exception as e:
             messagebox.showerror("Export Failed", f"Failed to export to CSV:\n{str(e)}")
     
     def _export_excel(self):
         """Export all orders to Excel format."""
-        if not pandas_available:
+        if not (xlsxwriter_available or openpyxl_available):
             messagebox.showerror("Library Missing", 
-                               "Excel export requires 'pandas' and 'openpyxl' libraries.\n"
-                               "Install them with: pip install pandas openpyxl")
+                               "Excel export requires the 'xlsxwriter' library.\n"
+                               "Install it with: pip install xlsxwriter")
             return
         
         try:
-            filepath = export_orders_to_excel(self.db)
+            filepath, order_count = export_orders_to_excel(self.db)
             
             # Open the file
             try:
-                if platform.system() == 'Windows':
-                    os.startfile(filepath)
-                elif platform.system() == 'Darwin':  # macOS
-                    subprocess.call(['open', filepath])
-                else:  # Linux
-                    subprocess.call(['xdg-open', filepath])
+                open_with_default_app(filepath)
             except Exception:
                 pass
             
@@ -1850,7 +2677,7 @@ class ManagerDashboard(ttk.Frame):
                               f"Orders exported to Excel successfully!\n\n"
                               f"File: {os.path.basename(filepath)}\n"
                               f"Location: {ASSETS_DIR}\n\n"
-                              f"Total orders exported: {len(self.db.list_orders())}")
+                              f"Total orders exported: {order_count}")
         except Exception as e:
             messagebox.showerror("Export Failed", f"Failed to export to Excel:\n{str(e)}")
     
@@ -1905,6 +2732,16 @@ class ManagerDashboard(ttk.Frame):
         ttk.Label(form_frame, text="Active:").grid(row=3, column=2, sticky="w", padx=6, pady=4)
         self.offer_active_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(form_frame, variable=self.offer_active_var).grid(row=3, column=3, sticky="w", padx=6, pady=4)
+        self._offer_form_defaults = (
+            (self.offer_name_var, ""),
+            (self.offer_item_var, ""),
+            (self.offer_type_var, "PERCENTAGE"),
+            (self.offer_value_var, ""),
+            (self.offer_start_var, ""),
+            (self.offer_end_var, ""),
+            (self.offer_day_var, ""),
+            (self.offer_active_var, True),
+        )
         
         ttk.Button(form_frame, text="⟲ Clear", style="Ghost.TButton", command=self._clear_offer_form).grid(row=4, column=0, padx=6, pady=8)
         
@@ -1923,6 +2760,8 @@ class ManagerDashboard(ttk.Frame):
             yscrollcommand=offers_scroll_y.set,
             xscrollcommand=offers_scroll_x.set
         )
+        configure_zebra_tags(self.offers_tree)
+        self._offers_shown: dict = {}
         
         for col, text, width in [
             ("name", "Offer Name", 150),
@@ -1955,22 +2794,33 @@ class ManagerDashboard(ttk.Frame):
     
     def _load_menu_items(self):
         """Load menu items into the combobox."""
-        menu_items = [("", "All Items")]
-        for item in self.db.list_menu():
-            menu_items.append((item["item_id"], item["item_name"]))
-        self.offer_item_combo['values'] = [f"{name} (ID: {id})" if id else name for id, name in menu_items]
+        # Display string -> item_id, so submitting the form needs no string parsing
+        self._offer_item_ids = {
+            f"{item['item_name']} (ID: {item['item_id']})": item["item_id"]
+            for item in self.db.list_menu()
+        }
+        self.offer_item_combo['values'] = ["All Items", *self._offer_item_ids]
+    
+    def _selected_offer_item_id(self) -> int | None:
+        """Item id chosen in the offer form, or None for "All Items"."""
+        item_str = self.offer_item_var.get()
+        if not item_str or item_str == "All Items":
+            return None
+        item_id = self._offer_item_ids.get(item_str)
+        if item_id is None:
+            # Selected offer's item was added after the combobox was filled: "Name (ID: 123)"
+            item_id = int(item_str.split("(ID:")[1].split(")")[0].strip())
+        return item_id
     
     def _load_offers(self):
-        """Load offers into the treeview."""
-        for i in self.offers_tree.get_children():
-            self.offers_tree.delete(i)
+        """Load offers into the treeview, touching only the rows that changed."""
         offers = self.db.list_offers()
-        for offer in offers:
-            self.offers_tree.insert(
-                "",
-                tk.END,
-                iid=str(offer["offer_id"]),
-                values=(
+        # Cached rows so selecting an offer needs no database round trip
+        self._offers_by_id = {offer["offer_id"]: offer for offer in offers}
+        rows = [
+            (
+                str(offer["offer_id"]),
+                (
                     offer["offer_name"],
                     offer["item_name"],
                     offer["discount_type"],
@@ -1981,22 +2831,16 @@ class ManagerDashboard(ttk.Frame):
                     "Yes" if offer["active"] else "No",
                 ),
             )
-        self._zebra_tree_offers()
-    
-    def _zebra_tree_offers(self):
-        """Apply zebra striping to offers treeview."""
-        self.offers_tree.tag_configure("odd", background=PALETTE["row_alt"])
-        for idx, iid in enumerate(self.offers_tree.get_children("")):
-            self.offers_tree.item(iid, tags=("odd",) if idx % 2 else ())
+            for offer in offers
+        ]
+        self._offers_shown = sync_tree_rows(self.offers_tree, rows, self._offers_shown, even_tags=())
     
     def _on_offer_select(self, event):
         """Populate form when offer is selected."""
         sel = self.offers_tree.focus()
         if not sel:
             return
-        offer_id = int(sel)
-        offers = self.db.list_offers()
-        offer = next((o for o in offers if o["offer_id"] == offer_id), None)
+        offer = self._offers_by_id.get(int(sel))
         if offer:
             self.offer_name_var.set(offer["offer_name"])
             if offer["item_id"]:
@@ -2012,33 +2856,21 @@ class ManagerDashboard(ttk.Frame):
     
     def _clear_offer_form(self):
         """Clear the offer form."""
-        self.offer_name_var.set("")
-        self.offer_item_var.set("")
-        self.offer_type_var.set("PERCENTAGE")
-        self.offer_value_var.set("")
-        self.offer_start_var.set("")
-        self.offer_end_var.set("")
-        self.offer_day_var.set("")
-        self.offer_active_var.set(True)
+        reset_vars(self._offer_form_defaults)
         self.offers_tree.selection_remove(self.offers_tree.selection())
     
     def _add_offer(self):
         """Add a new offer."""
         name = self.offer_name_var.get().strip()
         if not name:
-            messagebox.showwarning("Missing", "Enter offer name")
+            self.app.show_toast("Enter offer name", "warning")
             return
         
-        item_str = self.offer_item_var.get()
-        item_id = None
-        if item_str and item_str != "All Items":
-            try:
-                # Extract ID from "Item Name (ID: 123)"
-                if "(ID:" in item_str:
-                    item_id = int(item_str.split("(ID:")[1].split(")")[0].strip())
-            except:
-                messagebox.showerror("Error", "Invalid item selection")
-                return
+        try:
+            item_id = self._selected_offer_item_id()
+        except (IndexError, ValueError):
+            self.app.show_toast("Invalid item selection", "error")
+            return
         
         discount_type = self.offer_type_var.get()
         try:
@@ -2048,7 +2880,7 @@ class ManagerDashboard(ttk.Frame):
             if discount_type == "PERCENTAGE" and discount_value > 100:
                 raise ValueError("Percentage cannot exceed 100%")
         except ValueError as e:
-            messagebox.showerror("Invalid Value", f"Please enter a valid discount value.\n{str(e)}")
+            self.app.show_toast(f"Please enter a valid discount value.\n{str(e)}", "error")
             return
         
         start_date = self.offer_start_var.get().strip() or None
@@ -2059,34 +2891,30 @@ class ManagerDashboard(ttk.Frame):
         try:
             self.db.create_offer(name, item_id, discount_type, discount_value, 
                                 start_date, end_date, day_of_week, active)
-            messagebox.showinfo("Success", "Offer created successfully!")
+            self.app.show_toast("Offer created successfully!", "success")
             self._clear_offer_form()
             self._load_offers()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to create offer:\n{str(e)}")
+            self.app.show_toast(f"Failed to create offer:\n{str(e)}", "error")
     
     def _update_offer_ui(self):
         """Update selected offer."""
         sel = self.offers_tree.focus()
         if not sel:
-            messagebox.showwarning("Select", "Select an offer to update")
+            self.app.show_toast("Select an offer to update", "warning")
             return
         
         offer_id = int(sel)
         name = self.offer_name_var.get().strip()
         if not name:
-            messagebox.showwarning("Missing", "Enter offer name")
+            self.app.show_toast("Enter offer name", "warning")
             return
         
-        item_str = self.offer_item_var.get()
-        item_id = None
-        if item_str and item_str != "All Items":
-            try:
-                if "(ID:" in item_str:
-                    item_id = int(item_str.split("(ID:")[1].split(")")[0].strip())
-            except:
-                messagebox.showerror("Error", "Invalid item selection")
-                return
+        try:
+            item_id = self._selected_offer_item_id()
+        except (IndexError, ValueError):
+            self.app.show_toast("Invalid item selection", "error")
+            return
         
         discount_type = self.offer_type_var.get()
         try:
@@ -2096,7 +2924,7 @@ class ManagerDashboard(ttk.Frame):
             if discount_type == "PERCENTAGE" and discount_value > 100:
                 raise ValueError("Percentage cannot exceed 100%")
         except ValueError as e:
-            messagebox.showerror("Invalid Value", f"Please enter a valid discount value.\n{str(e)}")
+            self.app.show_toast(f"Please enter a valid discount value.\n{str(e)}", "error")
             return
         
         start_date = self.offer_start_var.get().strip() or None
@@ -2107,30 +2935,42 @@ class ManagerDashboard(ttk.Frame):
         try:
             self.db.update_offer(offer_id, name, item_id, discount_type, discount_value,
                                start_date, end_date, day_of_week, active)
-            messagebox.showinfo("Success", "Offer updated successfully!")
+            self.app.show_toast("Offer updated successfully!", "success")
             self._clear_offer_form()
             self._load_offers()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to update offer:\n{str(e)}")
+            self.app.show_toast(f"Failed to update offer:\n{str(e)}", "error")
     
     def _delete_offer_ui(self):
         """Delete selected offer."""
         sel = self.offers_tree.focus()
         if not sel:
-            messagebox.showwarning("Select", "Select an offer to delete")
+            self.app.show_toast("Select an offer to delete", "warning")
             return
         
         if messagebox.askyesno("Confirm", "Delete selected offer?"):
             try:
                 self.db.delete_offer(int(sel))
-                messagebox.showinfo("Success", "Offer deleted successfully!")
+                self.app.show_toast("Offer deleted successfully!", "success")
                 self._clear_offer_form()
                 self._load_offers()
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to delete offer:\n{str(e)}")
+                self.app.show_toast(f"Failed to delete offer:\n{str(e)}", "error")
+
+
+# Dashboard shown after login, by lower-cased role; any other role gets the manager view
+ROLE_FRAMES = {"student": "StudentDashboard", "attendant": "AttendantDashboard"}
+
+# Top bar text for the logged-in user, filled from the users row
+USER_LABEL_TEMPLATE = "{name} ({user_id}) | Role: {role}"
 
 
 class CanteenApp(tk.Tk):
+    # How often (ms) the Tk loop checks whether background work has finished
+    BACKGROUND_POLL_MS = 30
+    # How long (ms) a toast stays on screen
+    TOAST_MS = 2000
+
     def __init__(self):
         super().__init__()
         self.title("Canteen Payment System")
@@ -2138,6 +2978,8 @@ class CanteenApp(tk.Tk):
         self.minsize(900, 650)
         ensure_assets_dir_exists()
         self.db = DatabaseHandler(DB_PATH)
+        # Background work (dashboard queries) so SQLite never blocks the Tk event loop
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="canteen-worker")
         self.current_user: dict | None = None
 
         # Root background
@@ -2159,16 +3001,21 @@ class CanteenApp(tk.Tk):
         container.rowconfigure(0, weight=1)
         container.columnconfigure(0, weight=1)
 
+        # Dashboards are built on first show_frame(), so startup only pays for the login screen
+        self._container = container
+        self._frame_classes = {
+            cls.__name__: cls
+            for cls in (LoginWindow, StudentDashboard, AttendantDashboard, ManagerDashboard)
+        }
         self.frames: dict[str, ttk.Frame] = {}
-        self.frames["LoginWindow"] = LoginWindow(container, self, self.db)
-        self.frames["StudentDashboard"] = StudentDashboard(container, self, self.db)
-        self.frames["AttendantDashboard"] = AttendantDashboard(container, self, self.db)
-        self.frames["ManagerDashboard"] = ManagerDashboard(container, self, self.db)
-
-        for f in self.frames.values():
-            f.grid(row=0, column=0, sticky="nsew")
+        self._on_show_hooks: dict[str, object] = {}  # frame name -> bound on_show or None
+        self._loaded_stamps: dict[str, tuple] = {}  # frame name -> (db change stamp, user) at last on_show
+        self._current_frame_name: str | None = None
 
         self._build_topbar()
+        # Non-blocking status messages for routine edits (see show_toast)
+        self._toast_label = ttk.Label(self, padding=(16, 8))
+        self._toast_after: str | None = None
         self.show_frame("LoginWindow")
 
     def _build_topbar(self):
@@ -2176,198 +3023,113 @@ class CanteenApp(tk.Tk):
         self.topbar.pack(fill=tk.X, side=tk.TOP)
         title = ttk.Label(self.topbar, text="🍽  Canteen", style="Title.TLabel")
         title.pack(side=tk.LEFT, padx=12, pady=8)
+        # User and role share one label so login/logout update it with a single configure
         self.user_label = ttk.Label(self.topbar, text="Not logged in", style="Subtle.TLabel")
         self.user_label.pack(side=tk.LEFT, padx=8)
-        self.role_label = ttk.Label(self.topbar, text="", style="Subtle.TLabel")
-        self.role_label.pack(side=tk.LEFT)
         # Make logout button more visible with danger style
         self.nav_button = ttk.Button(self.topbar, text="🚪 Logout", style="Danger.TButton", command=self._logout)
         self.nav_button.pack(side=tk.RIGHT, padx=12, pady=6)
 
     def _setup_styles(self) -> None:
-        style = ttk.Style(self)
-        try:
+        # One Style object for the app's lifetime; any later restyling should reuse it
+        self._style = style = ttk.Style(self)
+        if "clam" in style.theme_names():
             style.theme_use("clam")
-        except Exception:
-            pass
-
-        # Frames
-        style.configure("Topbar.TFrame", background=PALETTE["panel"], relief="flat") 
-        style.configure("Panel.TFrame", background=PALETTE["panel"], relief="flat") 
-        style.configure("PanelAlt.TFrame", background=PALETTE["panel_alt"], relief="flat") 
-        style.configure("Card.TFrame", background=PALETTE["panel_alt"], relief="flat")
-
-        # Labels
-        style.configure("TLabel", background=PALETTE["panel"], foreground=PALETTE["text"], font=("Segoe UI", 11))
-        style.configure("Subtle.TLabel", background=PALETTE["panel"], foreground=PALETTE["text_secondary"], font=("Segoe UI", 10))
-        style.configure("Title.TLabel", background=PALETTE["panel"], foreground=PALETTE["text"], font=("Segoe UI", 16, "bold"))
-        style.configure("FormLabel.TLabel", background=PALETTE["panel_alt"], foreground=PALETTE["text"], font=("Segoe UI", 10))
-
-        # Buttons
-        style.configure("TButton", padding=(12, 8), font=("Segoe UI", 10, "bold"), foreground="#ffffff", borderwidth=0) 
-        style.map("TButton",
-                  background=[("active", PALETTE["primary_hover"]), ("!active", PALETTE["primary"])],
-                  relief=[("pressed", "sunken"), ("!pressed", "flat")])
-        style.configure("Primary.TButton", background=PALETTE["primary"], foreground="#ffffff", padding=(16, 10))
-        style.map("Primary.TButton", background=[("active", PALETTE["primary_hover"])])
-        style.configure("Accent.TButton", background=PALETTE["accent"], foreground="#ffffff", padding=(16, 10))
-        style.map("Accent.TButton", background=[("active", PALETTE["accent_hover"])])
-        style.configure("Danger.TButton", background=PALETTE["danger"], foreground="#ffffff", padding=(12, 8))
-        style.map("Danger.TButton", background=[("active", PALETTE["danger_hover"])])
-        style.configure("Ghost.TButton", background=PALETTE["panel"], foreground=PALETTE["text"], relief="flat", padding=(10, 6))
-        style.map("Ghost.TButton",
-                  background=[("active", PALETTE["panel_hover"])],
-                  foreground=[("!active", PALETTE["link"]), ("active", PALETTE["link_hover"])])
-        # Extra button variants
-        style.configure("Success.TButton", background=PALETTE["success"], foreground="#001b10", padding=(14, 9))
-        style.map("Success.TButton", background=[("active", PALETTE["success_hover"])])
-        style.configure("Warning.TButton", background=PALETTE["warning"], foreground="#1a0f00", padding=(14, 9))
-        style.map("Warning.TButton", background=[("active", PALETTE["warning_hover"])])
-        style.configure("Info.TButton", background=PALETTE["info"], foreground="#00121a", padding=(14, 9))
-        style.map("Info.TButton", background=[("active", PALETTE["info_hover"])])
-
-        # Entry Fields - Custom styled with dark background
-        style.configure("TEntry",
-                       fieldbackground=PALETTE["input_bg"],
-                       foreground=PALETTE["text"],
-                       borderwidth=1,
-                       relief="solid",
-                       padding=8,
-                       insertcolor=PALETTE["text"],
-                       font=("Segoe UI", 10))
-        style.map("TEntry",
-                 fieldbackground=[("focus", PALETTE["input_focus"]), ("!focus", PALETTE["input_bg"])],
-                 bordercolor=[("focus", PALETTE["border_focus"]), ("!focus", PALETTE["border"])])
-
-        # Combobox - Properly styled dropdown
-        style.configure("TCombobox",
-                       fieldbackground=PALETTE["input_bg"],
-                       foreground=PALETTE["text"],
-                       background=PALETTE["panel_alt"],
-                       borderwidth=1,
-                       relief="solid",
-                       padding=8,
-                       arrowcolor=PALETTE["text"],
-                       font=("Segoe UI", 10))
-        style.map("TCombobox",
-                 fieldbackground=[("focus", PALETTE["input_focus"]), ("readonly", PALETTE["input_bg"]), ("!focus", PALETTE["input_bg"])],
-                 bordercolor=[("focus", PALETTE["border_focus"]), ("!focus", PALETTE["border"])],
-                 arrowcolor=[("active", PALETTE["text"])],
-                 background=[("readonly", PALETTE["input_bg"])])
-        
-        # Combobox dropdown styling (popup window)
+        # Keep references: a Font object deletes its named font when garbage collected
+        self._fonts = [tkfont.Font(self, name=name, **spec) for name, spec in APP_FONTS.items()]
+        for pattern, value in TK_OPTIONS:
+            self.option_add(pattern, value)
+        style.theme_settings(style.theme_use(), TTK_STYLE_SETTINGS)
+
+    def run_in_background(self, work, on_done, error_text: str = "Background task failed") -> None:
+        """Run work() on the worker pool and pass its result to on_done() on the Tk thread.
+
+        Use for database reads that would otherwise stall the event loop; on_done
+        may touch widgets, work() must not.
+        """
+        future = self.executor.submit(work)
+        self.after(self.BACKGROUND_POLL_MS, self._poll_background, future, on_done, error_text)
+
+    def _poll_background(self, future, on_done, error_text: str) -> None:
+        # Tk is not thread-safe, so poll from the main loop rather than calling back from the worker
+        if not future.done():
+            self.after(self.BACKGROUND_POLL_MS, self._poll_background, future, on_done, error_text)
+            return
         try:
-            style.configure("TCombobox.Listbox",
-                           background=PALETTE["input_bg"],
-                           foreground=PALETTE["text"],
-                           selectbackground=PALETTE["primary"],
-                           selectforeground="#ffffff",
-                           borderwidth=1,
-                           relief="solid",
-                           font=("Segoe UI", 10))
-        except Exception:
-            pass
+            result = future.result()
+        except Exception as e:
+            # Loads queued by on_show land here; forget the load stamps so the next visit retries
+            self._loaded_stamps.clear()
+            messagebox.showerror("Error", f"{error_text}:\n{str(e)}")
+            return
+        on_done(result)
 
-        # Spinbox
-        try:
-            style.configure("TSpinbox",
-                           fieldbackground=PALETTE["input_bg"],
-                           foreground=PALETTE["text"],
-                           borderwidth=1,
-                           relief="solid",
-                           padding=6,
-                           insertcolor=PALETTE["text"],
-                           arrowcolor=PALETTE["text"],
-                           font=("Segoe UI", 10))
-            style.map("TSpinbox",
-                     fieldbackground=[("focus", PALETTE["input_focus"]), ("!focus", PALETTE["input_bg"])],
-                     bordercolor=[("focus", PALETTE["border_focus"]), ("!focus", PALETTE["border"])])
-        except Exception:
-            pass
+    def show_toast(self, message: str, kind: str = "info") -> None:
+        """Show message at the bottom of the window for TOAST_MS without blocking input.
+
+        kind is "info", "success", "warning" or "error". A new toast replaces the current one.
+        """
+        if self._toast_after is not None:
+            self.after_cancel(self._toast_after)
+        self._toast_label.configure(text=message, style=f"Toast{kind.capitalize()}.TLabel")
+        self._toast_label.place(relx=0.5, rely=1.0, y=-16, anchor="s")
+        self._toast_label.lift()
+        self._toast_after = self.after(self.TOAST_MS, self._hide_toast)
 
-        # Checkbutton
-        style.configure("TCheckbutton",
-                       background=PALETTE["panel_alt"],
-                       foreground=PALETTE["text"],
-                       font=("Segoe UI", 10))
-        style.map("TCheckbutton",
-                 background=[("active", PALETTE["panel_alt"]), ("selected", PALETTE["panel_alt"])])
-
-        # Notebook
-        style.configure("TNotebook", background=PALETTE["panel"], borderwidth=0, relief="flat") 
-        style.configure("TNotebook.Tab",
-                       padding=(18, 10),
-                       font=("Segoe UI", 11, "bold"),
-                       background=PALETTE["panel"],
-                       foreground=PALETTE["text_secondary"],
-                       borderwidth=0) 
-        style.map("TNotebook.Tab",
-                 background=[("selected", PALETTE["accent_alt"]), ("!selected", PALETTE["panel"])],
-                 foreground=[("selected", "#ffffff"), ("!selected", PALETTE["text_secondary"])],
-                 expand=[("selected", [1, 1, 1, 0])])
-
-        # Treeview
-        style.configure("Treeview",
-                       background=PALETTE["panel"],
-                       fieldbackground=PALETTE["panel"],
-                       foreground=PALETTE["text"],
-                       rowheight=32,
-                       font=("Segoe UI", 10),
-                       borderwidth=0,
-                       relief="flat")
-        style.map("Treeview",
-                 background=[("selected", PALETTE["selection_bg"])],
-                 foreground=[("selected", PALETTE["selection_fg"])])
-        style.configure("Treeview.Heading",
-                       font=("Segoe UI", 11, "bold"),
-                       background=PALETTE["table_header"],
-                       foreground=PALETTE["text"],
-                       relief="flat",
-                       borderwidth=0,
-                       padding=(8, 8))
-
-        # Labelframe
-        style.configure("TLabelframe",
-                       background=PALETTE["panel"],
-                       relief="flat",
-                       borderwidth=1,
-                       bordercolor=PALETTE["border"]) 
-        style.configure("TLabelframe.Label",
-                       background=PALETTE["panel"],
-                       foreground=PALETTE["text"],
-                       font=("Segoe UI", 11, "bold"))
+    def _hide_toast(self) -> None:
+        self._toast_after = None
+        self._toast_label.place_forget()
 
     def show_frame(self, name: str) -> None:
-        frame = self.frames[name]
+        if name == self._current_frame_name:
+            return  # Already on top; skip the raise and the on_show reload
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = self.frames[name] = self._frame_classes[name](self._container, self, self.db)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self._on_show_hooks[name] = getattr(frame, "on_show", None)
+            # Lay out a new frame before raising it so it doesn't flash half-drawn; cached frames skip this
+            frame.update_idletasks()
         frame.tkraise()
-        if hasattr(frame, "on_show"):
-            try:
-                frame.on_show()
-            except Exception:
-                pass
+        # Set only once the frame exists and is on top, so a failed build can be retried
+        self._current_frame_name = name
+        on_show = self._on_show_hooks[name]
+        if on_show is not None:
+            # Reload only if the data or the logged-in user changed since this frame last loaded
+            user_id = self.current_user["user_id"] if self.current_user else None
+            stamp = (self.db.change_stamp(), user_id)
+            if self._loaded_stamps.get(name) != stamp:
+                try:
+                    on_show()
+                except Exception as e:
+                    # Stamp not recorded, so the next visit retries the load
+                    self.show_toast(f"Failed to load: {e}", "error")
+                else:
+                    self._loaded_stamps[name] = stamp
 
     def set_user(self, user: dict) -> None:
         self.current_user = user
-        self.user_label.config(text=f"{user['name']} ({user['user_id']})")
-        self.role_label.config(text=f" | Role: {user['role']}")
-        role = user["role"].lower()
-        if role == "student":
-            self.show_frame("StudentDashboard")
-        elif role == "attendant":
-            self.show_frame("AttendantDashboard")
-        else:
-            self.show_frame("ManagerDashboard")
+        self.user_label.config(text=USER_LABEL_TEMPLATE.format_map(user))
+        self.show_frame(ROLE_FRAMES.get(user["role"].lower(), "ManagerDashboard"))
 
     def _logout(self):
         self.current_user = None
         self.user_label.config(text="Not logged in")
-        self.role_label.config(text="")
+        attendant = self.frames.get("AttendantDashboard")
+        if attendant is not None:
+            attendant.reset_paging()
+            # The stamp may still match at the next login, so force a reload of the first page
+            self._loaded_stamps.pop("AttendantDashboard", None)
         self.show_frame("LoginWindow")
 
 
 def main():
     app = CanteenApp()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        app.executor.shutdown(wait=False, cancel_futures=True)
+        app.db.close()
 
 
 if __name__ == "__main__":